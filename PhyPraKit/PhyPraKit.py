@@ -12,16 +12,34 @@ from __future__ import print_function  # for python2.7 compatibility
 
   contains the following functions:
 
-      1. Data input:
+      1. Data input (input files may be compressed with gzip, bz2, xz or zip):
 
         - readColumnData() read data and meta-data from text file
         - readCSV()        read data in csv-format from file with header
         - readtxt()        read data in "txt"-format from file with header
         - readPicoScope()  read data from PicoScope
+            ``(readCSV, readtxt, readPicoScope: option blocksize
+            for block-wise reading of large files)``
+        - readPicoScopeSegments() read series of PicoScope waveforms 
+            into 3d array
+        - followtxt()      read lines appended to a file still being written
         - readCassy()      read CASSY output file in .txt format   
         - labxParser()     read CASSY output file, .labx format   
+        - LazyChannelList  channel data decoded on first access,
+            returned by labxParser() and readPicoScope() with lazy=True
+        - readMany()       read many files in parallel processes
+        - readAsync()      read file in executor, for use with asyncio
+        - readManyAsync()  read many files in parallel, for use with asyncio
+        - readAny()        read file with reader chosen by format detection
+        - setParseCache()  enable persistent cache for parsed input files
+        - clearParseCache() invalidate entries of parse cache
+        - parseCacheInfo() list entries of parse cache
+        - RunArchive       archive of many measurements with index of 
+            meta-data, channels and sizes, for fast queries
         - writeCSV()       write data in csv-format (opt. with header)
         - writeTexTable()  write data in LaTeX table format
+        - writeBinary()    write data in binary, column-oriented format
+        - readBinary()     read data written by writeBinary(), memory-mapped
 
       2. signal processing:
 
@@ -35,6 +53,7 @@ from __future__ import print_function  # for python2.7 compatibility
         - Fourier_fft()       fast Fourier transformation of an array
         - FourierSpectrum()   Fourier transformation of an array 
             ``(slow, preferably use fft version)``
+        - LombScargle()       amplitude spectrum for non-equidistant samples
         - autocorrelate()     autocorrelation function
 
       3. statistics:
@@ -73,7 +92,7 @@ from __future__ import print_function  # for python2.7 compatibility
 # Author:       G. Quast   Dec. 2013
 # dependencies: PYTHON v2.7, numpy, matplotlib.pyplot 
 #
-# last modified: Feb. 2019
+# last modified: Oct. 2026
 #   16-Nov-16    GQ  readPicoscope now also supports .csv export format    
 #                GQ  added fuctions for signal processing/analysis
 #   17-Nov-16    GQ  added readCassy for Cassy data in .txt format
@@ -91,6 +110,30 @@ from __future__ import print_function  # for python2.7 compatibility
 #   05-Feb-19    CV  added line ending chars to createCSV(), to export
 #                    data for example as a latex table
 #   07-Feb-19    GQ  merged pull request by CV, vers. 1.0.2
+#   18-Oct-26    GQ  labxParser(): streaming engine with constant memory
+#                    labxParser(): fast engine on byte level
+#                    labxParser(), readCassy(): selection of channels
+#                    persistent parse cache for all readers
+#                    readtxt(): bulk filtering and conversion of data
+#                    readCSV(), readtxt(), readPicoScope(): block-wise
+#                       reading of data with option blocksize
+#                    followtxt(): follow files during data taking
+#                    readMany(): parallel reading of many files
+#                    writeBinary(), readBinary(): binary column format
+#                    readers: options dtype and contiguous
+#                    readPicoScopeSegments(): series of PicoScope waveforms
+#                    readers: decompression of compressed input files
+#                    labxParser(), readPicoScope(): option lazy
+#                    readAny(): automatic detection of file format
+#                    readAsync(), readManyAsync(): input for asyncio
+#                    RunArchive: indexed archive of measurements
+#                    writeCSV(): block-wise formatting, compressed output
+#                    readColumnData(): single-pass parsing, bounded printout
+#                    meanFilter(): sliding sums, edge treatment, axis
+#                    resample(): block-wise averaging, polyphase mode
+#                    Fourier_fft(): real-input transform, windows, channels
+#                    FourierSpectrum(): blocked evaluation, frequency grid
+#                    LombScargle(): spectrum for non-equidistant samples
 # ----------------------------------------------------------------------
 
 import numpy as np, matplotlib.pyplot as plt
@@ -98,7 +141,8 @@ from scipy import stats
 
 ## ------- section 1: input from text files ------------------------
 
-def readColumnData(fname, cchar='#', delimiter=None, pr=True):
+def readColumnData(fname, cchar='#', delimiter=None, pr=True, 
+                   dtype=np.float32, contiguous=False, cache=None):
   """read column-data from file
        - input is assumed to be columns of floats
        - characters following <cchar>, and <cchar> itself, are ignored          
@@ -109,58 +153,47 @@ def readColumnData(fname, cchar='#', delimiter=None, pr=True):
        * string fnam:      file name
        * int ncols:        number of columns
        * char delimiter:   character separating columns
-       * bool pr:          print input to std out if True
+       * bool pr:          print summary of input to std out if True
+       * dtype:            data type of result
+       * bool contiguous:  if True, values of each column are
+         contiguous in memory (C-order)
+       * bool cache:       use parse cache, see ``setParseCache()``
   """ 
 
-# -- helper function to filter input lines
-  def filter_lines(f, keys, cc='#', delim=None):
-    """ filter lines for np.loadtxt and 
-        extract non-numerical information
-
-      Args:
-        * string f:  file name
-        * dictionary keys: emtpy dictionary
-        * char cc:   comment character
-      Modifies:
-        * dictionary keys with keywords found in file
-      Yields:
-        * a valid line with numerical data
-    """
-    while True:
-      line=f.readline()
-      if (not line): break # eof, exit
-      if cc in line:
-        line=line.split(cc)[0] # ignore everything after comment character    
-        if (not line): continue # ignore comment lines
-      if (not line.isspace()):  # ignore empty lines
-         words=line.split()
-         if (words[0][0]=="*"): # definition of a key
-           keys[words[0]]=' '.join(words[1:]) # get rest of line 
-         else:
-           # have a valid line, change delimiter to white space
-           if (delim != None): line=line.replace(delim, ' ')
-           yield line  # pass line to loadtxt()
-#   -- end filter_lines
-
 # -------------------------------------------------------
 # define a dictionary for meta data from file
   mdict = {}
-  arr = np.loadtxt( filter_lines(open(fname,'r'), 
-                    mdict, delim=delimiter, cc=cchar),
-                    dtype=np.float32, unpack=True)
-
-# eventually, print out the data we just read:
+  if _useCache(cache, fname):
+    arr, mdict = _cachedRead(readColumnData, fname, 
+                             cchar=cchar, delimiter=delimiter, pr=False,
+                             dtype=dtype, contiguous=contiguous)
+  else:
+    f = _openInput(fname)
+    try:
+      text = f.read()
+    finally:
+      f.close()
+    arr = _columnParse(text, mdict, cc=cchar, delim=delimiter, dtype=dtype)
+    if contiguous: arr = np.ascontiguousarray(arr)
+
+# eventually, print a summary of the data we just read:
   if pr:
     print("\n*==* readColumnData: file read successfully")
     print("keywords found:")
     for key in mdict:
       if (mdict[key]!=None): print(key, ':', mdict[key])
-    print("data read:")
-    for i in range(arr.shape[0]): print(arr[i])
+    if arr.ndim > 1:
+      print("data read: %i columns, %i rows"%arr.shape)
+    else: 
+      print("data read: %i values"%arr.size)
+    with np.printoptions(threshold=10, edgeitems=3):
+      for i in range(min(arr.shape[0], 10)): print(arr[i])
+    if arr.shape[0] > 10: print("  ...")
 
   return arr, mdict
 
-def readCSV(file, nlhead=1):
+def readCSV(file, nlhead=1, blocksize=None, dtype=np.float64, 
+            contiguous=False, cache=None):
   '''
   read Data in .csv format, skip header lines
   
@@ -168,15 +201,24 @@ def readCSV(file, nlhead=1):
     * file: string, file name 
     * nhead: number of header lines to skip
     * delim: column separator
+    * blocksize: if given, read data in blocks of (up to) blocksize lines
+    * dtype: data type of result
+    * contiguous: if True, values of each column are contiguous 
+      in memory (C-order)
+    * cache: use parse cache, see ``setParseCache()``
   Returns:
     * hlines: list of string, header lines
-    * data: 2d array, 1st index for columns
+    * data: 2d array, 1st index for columns, 
+      or, if blocksize is given, a generator yielding such arrays
 
   '''
 # --------------------------------------------------------------------
+  if blocksize is None and _useCache(cache, file):
+    return _cachedRead(readCSV, file, nlhead=nlhead, dtype=dtype, 
+                       contiguous=contiguous)
 
   # open file for read (if necessary)
-  if type(file)==type(' '): f = open(file, 'r') # file is a file name
+  if type(file)==type(' '): f = _openInput(file) # file is a file name
   else: f=file     # assume input is file handle of an open file 
 
   hlines=[]
@@ -186,93 +228,398 @@ def readCSV(file, nlhead=1):
    hlines.append(f.readline()) # header line(s)
 
   # read data
-  data = np.loadtxt(f, delimiter=',', unpack=True) # column-wise data
+  if blocksize:  # return generator for blocks of data
+    return hlines, _blockReader(f, blocksize, ',', dtype=dtype,
+                                contiguous=contiguous, close=f is not file)
+  data = np.loadtxt(f, dtype=dtype, delimiter=',', unpack=True) # column-wise data
+  if contiguous: data = np.ascontiguousarray(data)
   return hlines, data
 
 
-def readtxt(file, nlhead=1, delim='\t'):
+def readtxt(file, nlhead=1, delim='\t', usecols=None, blocksize=None,
+            dtype=np.float32, contiguous=False, cache=None):
   '''
   read floating point data in general txt format
-    skip header lines, replace decimal comma, remove special characters
+    skip header lines, replace decimal comma, remove special characters;
+    the data part is filtered and converted as a whole (not line by line)
   
   Args:
     * file: string, file name 
     * nhead: number of header lines to skip
-    * delim: column separator
+    * delim: column separator, None for any white space
+    * usecols: list of indices of columns to read (default: all)
+    * blocksize: if given, read data in blocks of (up to) blocksize lines
+    * dtype: data type of result
+    * contiguous: if True, values of each column are contiguous 
+      in memory (C-order)
+    * cache: use parse cache, see ``setParseCache()``
   Returns:
     * hlines: list of string, header lines
-    * data: 2d array, 1st index for columns
+    * data: 2d array, 1st index for columns, 
+      or, if blocksize is given, a generator yielding such arrays
 
   '''
 # --------------------------------------------------------------------
-# -- helper function to filter input lines
-  def specialCharFilter(f, delim):
-    '''a generator fo filter lines read from file
-         replace German ',' by '.', remove special characters 
-
-      Args:
-        * string f:  file name
-      Yields:
-        * a valid line with numerical data
-    '''
-    while True:
-      l=f.readline().strip()  # remove leading and trailing white spaces
-      if (not l): break       # end-of-file reached, exit
-
-      # remove ascii contol characters (except delimiter) 
-      for i in range(32):
-        if delim != chr(i) : l=l.replace(chr(i),'') 
-      if l=='': continue        # skip empty lines
-      # replace German decimal comma (if not CSV format)
-      if delim != ',' : filtline=l.replace(',','.') 
-
-      yield filtline                # pass filtered line to loadtxt()
-#   -- end specialCharFilter
+  if blocksize is None and _useCache(cache, file):
+    return _cachedRead(readtxt, file, nlhead=nlhead, delim=delim, 
+                       usecols=usecols, dtype=dtype, contiguous=contiguous)
 
   # open file for read (if necessary)
-  if type(file)==type(' '): f = open(file, 'r') # file is a file name
+  if type(file)==type(' '): f = _openInput(file) # file is a file name
   else: f = file        # assume input is file handle of an open file 
 
   hlines=[]
-  lfilt = specialCharFilter(f, delim) # python generator 
+  lfilt = _specialCharFilter(f, delim) # python generator 
   # read header
   for i in range (nlhead):
     hlines.append(next(lfilt)) # header line(s)
 
-  # read float data
-  data = np.loadtxt(lfilt, dtype=np.float32, delimiter=delim, unpack=True)
+  # read float data, filtered and converted in bulk
+  if blocksize:  # return generator for blocks of data
+    return hlines, _blockReader(f, blocksize, delim, dtype=dtype,
+                  usecols=usecols, contiguous=contiguous, close=f is not file)
+  data = _bulkParse(f.read(), delim, dtype=dtype, usecols=usecols)
+  if contiguous: data = np.ascontiguousarray(data)
   return hlines, data
 
+def _specialCharFilter(f, delim):
+  '''a generator fo filter lines read from file
+       replace German ',' by '.', remove special characters 
+
+    Args:
+      * string f:  file name
+    Yields:
+      * a valid line with numerical data
+  '''
+  while True:
+    l=f.readline()
+    if (not l): break       # end-of-file reached, exit
+    l=l.strip()             # remove leading and trailing white spaces
+
+    # remove ascii contol characters (except delimiter) 
+    for i in range(32):
+      if (delim or '\t') != chr(i) : l=l.replace(chr(i),'') 
+    if l=='': continue        # skip empty lines
+    # replace German decimal comma (if not CSV format)
+    if delim != ',' : l=l.replace(',','.') 
+
+    yield l                   # pass filtered line to loadtxt()
+
+def _compression(fname):
+  '''
+  detect compressed file from its first bytes 
+
+  Args:
+    * fname: string, file name 
+  Returns:
+    * 'gzip', 'bz2', 'xz', 'zip' or None for uncompressed file
+  '''
+  with open(fname, 'rb') as f:
+    magic = f.read(6)
+  for comp, m in (('gzip', b'\x1f\x8b'), ('bz2', b'BZh'), 
+                  ('xz', b'\xfd7zXZ\x00'), ('zip', b'PK\x03\x04')):
+    if magic.startswith(m): return comp
+  return None
+
+def _openInput(fname, mode='r'):
+  '''
+  open input file; compressed files (gzip, bz2, xz or zip with one 
+  member) are decompressed while reading, no temporary files are created
+
+  Args:
+    * fname: string, file name
+    * mode: 'r' for text, 'rb' for binary input
+  Returns:
+    * file object
+  '''
+  comp = _compression(fname)
+  if comp is None: 
+    return open(fname, mode)
+  if comp == 'gzip':
+    import gzip
+    f = gzip.GzipFile(fname, 'rb')
+  elif comp == 'bz2':
+    import bz2
+    f = bz2.BZ2File(fname, 'rb')
+  elif comp == 'xz':
+    import lzma  # python 3 only
+    f = lzma.LZMAFile(fname, 'rb')
+  else: 
+    import zipfile
+    z = zipfile.ZipFile(fname)
+    f = z.open([n for n in z.namelist() if not n.endswith('/')][0])
+  if mode == 'rb': return f
+  import io
+  return io.TextIOWrapper(f)
+
+def _txtFilterTable(delim, sep=None):
+  '''
+  translation table to remove ascii control characters (except 
+  delimiter and newline) and to replace German decimal comma 
+  (if not CSV format) in a single pass over a string
+
+  Args:
+    * delim: column separator, None for any white space (tabs are kept)
+    * sep: replacement for delimiter (optional)
+  Returns:
+    * dictionary for str.translate()
+  '''
+  table = dict([(i, None) for i in range(32) 
+                if chr(i) not in (delim or '\t', '\n')])
+  if delim != ',': table[ord(',')] = '.'
+  if sep is not None: table[ord(delim)] = sep
+  return table
+
+def _columnParse(text, keys, cc='#', delim=None, dtype=np.float32):
+  '''
+  split text of readColumnData() into meta-data and numerical part
+  and convert all numbers in one step
+
+  method: 
+    comments are removed from the text as a whole, only lines 
+    containing '*' are inspected for keywords, and the remaining 
+    lines are converted by a single call of ``np.loadtxt()``
+
+  Args:
+    * text: string, content of file
+    * keys: dictionary, receives keywords (words preceeded by '*')
+    * cc: comment character
+    * delim: column separator (default: white space)
+    * dtype: data type of result
+  Returns:
+    * data: 2d array, 1st index for columns
+  '''
+  import re
+  if cc in text: # ignore everything after comment character
+    text = re.sub(re.escape(cc) + '.*', '', text)
+  klines = []
+  if '*' in text:  # definition of keys
+    for l in [l for l in text.split('\n') if '*' in l]:
+      words = l.split()
+      if words[0][0] == '*': 
+        keys[words[0]] = ' '.join(words[1:]) # get rest of line
+        klines.append(l)
+  if delim is not None: # change delimiter to white space
+    text = text.replace(delim, ' ')
+  lines = text.split('\n')
+  if klines:
+    lines = [l for l in lines if '*' not in l or l.split()[0][0] != '*']
+  # empty lines are skipped by np.loadtxt() 
+  return np.loadtxt(lines, dtype=dtype, unpack=True)
+
+def _bulkParse(text, delim, dtype=np.float32, usecols=None, ndmin=0):
+  '''
+  convert a block of lines with numerical data in text format
+
+  method: 
+    control characters and decimal commas are treated in a single 
+    pass over the text, and all numbers are converted in one step; 
+    for irregular input (comments, empty fields, trailing delimiters)
+    or if only some columns are selected, the filtered lines are 
+    handed to ``np.loadtxt()``
 
-def readPicoScope(file, prlevel=0):
+  Args:
+    * text: string, lines with numerical data
+    * delim: column separator, None for any white space
+    * dtype: data type of result
+    * usecols: list of indices of columns to read (default: all)
+    * ndmin: 2 to keep dimensions of length one, as in ``np.loadtxt()``
+  Returns:
+    * data: 2d array, 1st index for columns
+  '''
+  if isinstance(text, bytes): text = text.decode('latin-1') # python2 
+  ftext = text.translate(_txtFilterTable(delim))
+  if usecols is None and '#' not in ftext:
+    import warnings
+    rows = [l for l in ftext.split('\n') if l.strip()] # non-empty lines
+    if delim is None: # number of fields separated by white space
+      nfields = [len(l.split()) for l in rows]
+    else:
+      nfields = [l.count(delim) + 1 for l in rows]
+    ncols = nfields[0] if rows else 0
+    # same number of fields in all rows ? 
+    if rows and set(nfields) == set([ncols]):
+      # treat delimiter as white space and convert everything at once
+      if delim and not delim.isspace(): ftext = ftext.replace(delim, ' ')
+      with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # numpy warns on unparsed input
+        try:
+          data = np.fromstring(ftext, dtype=dtype, sep=' ')
+        except ValueError:
+          data = np.zeros(0)
+      if data.size == len(rows)*ncols: # all fields converted
+        data = data.reshape(len(rows), ncols).T
+        return data if ndmin == 2 else np.squeeze(data)
+  # irregular input: line-wise conversion, as in np.loadtxt()
+  lines = [l.strip() for l in text.translate(_txtFilterTable(delim)).split('\n')]
+  lines = [l for l in lines if l]
+  if usecols is None and ndmin != 2:
+    return np.loadtxt(lines, dtype=dtype, delimiter=delim, unpack=True)
+  else: # only selected columns are converted
+    return np.loadtxt(lines, dtype=dtype, delimiter=delim, unpack=True,
+                      usecols=usecols, ndmin=2)
+
+def _blockReader(f, blocksize, delim, dtype=np.float32, usecols=None,
+                 ncols=None, contiguous=False, close=False):
+  '''
+  generator to read numerical data in blocks of lines; memory usage 
+  is determined by the block size, independent of file size
+
+  Args:
+    * f: file handle, positioned after header lines
+    * blocksize: number of lines per block
+    * delim: column separator
+    * dtype: data type of result
+    * usecols: list of indices of columns to read (default: all)
+    * ncols: expected number of columns (optional)
+    * contiguous: if True, values of each column are contiguous in memory
+    * close: close file after last block
+  Yields:
+    * data: 2d array, 1st index for columns, up to blocksize rows
+  Raises:
+    * ValueError: if number of columns differs from ncols 
+  '''
+  from itertools import islice
+  try:
+    while True:
+      text = ''.join(islice(f, blocksize))
+      if not text: break         # end-of-file reached
+      if not text.strip(): continue # skip blocks of empty lines
+      data = _bulkParse(text, delim, dtype=dtype, usecols=usecols, ndmin=2)
+      if ncols is not None and len(data) != ncols:
+        raise ValueError(
+          "number of data columns inconsistent with number of units")
+      yield np.ascontiguousarray(data) if contiguous else data
+  finally:
+    if close: f.close()
+
+def followtxt(file, nlhead=1, delim='\t', usecols=None, dtype=np.float32):
+  '''
+  follow a file which is still being written, e.g. by CASSY or PicoScope 
+  during data taking: generator returning on each call the complete 
+  lines of data appended since the previous call; an incomplete last 
+  line is held back until it is terminated; the cost of a call is 
+  proportional to the amount of new data  
+
+  Header lines are filtered as in ``readtxt()``; use delim=',' for 
+  files in .csv format, and nlhead=3 for PicoScope data.
+
+  Args:
+    * file: string, file name 
+    * nhead: number of header lines
+    * delim: column separator
+    * usecols: list of indices of columns to read (default: all)
+    * dtype: data type of result
+  Yields:
+    * hlines: list of string, header lines (incomplete while 
+      header is being written)
+    * data: 2d array, 1st index for columns, new lines only
+
+  Example::
+
+    poll = followtxt('data.txt', nlhead=2)
+    while measuring:
+      hlines, data = next(poll)
+      # ... process new data
+      time.sleep(2.)
+
+  '''
+# --------------------------------------------------------------------
+  import os
+  f = open(file, 'rb')
+  offset = 0       # position after last complete line
+  hlines = []
+  ncols = 0
+  try:
+    while True:
+      if os.fstat(f.fileno()).st_size < offset: # file was re-written
+        offset = 0
+        hlines = []
+      f.seek(offset)
+      buf = f.read()
+      buf = buf[:buf.rfind(b'\n')+1] # hold back incomplete last line
+      offset += len(buf)
+      # read header
+      while len(hlines) < nlhead and buf:
+        i = buf.find(b'\n') + 1
+        l = buf[:i].decode('utf-8', 'replace').strip()
+        buf = buf[i:]
+        l = l.translate(_txtFilterTable(delim))
+        if l: hlines.append(l)  # skip empty lines, as in readtxt()
+      # read new data
+      if buf.strip():
+        data = _bulkParse(buf, delim, dtype=dtype, usecols=usecols, ndmin=2)
+        ncols = len(data)
+      else:
+        data = np.zeros((ncols, 0), dtype=dtype)
+      yield hlines, data
+  finally:
+    f.close()
+
+
+def readPicoScope(file, prlevel=0, blocksize=None, dtype=np.float32,
+                  contiguous=False, lazy=False, cache=None):
   '''
   read Data exported from PicoScope in .txt or .csv format
   
   Args:
     * file: string, file name 
     * prlevel: printout level, 0 means silent
+    * blocksize: if given, read data in blocks of (up to) blocksize lines
+    * dtype: data type of result
+    * contiguous: if True, values of each channel are contiguous 
+      in memory (C-order)
+    * lazy: if True, only the header is read, data are returned as
+      ``LazyChannelList`` and read on first access to any channel
+    * cache: use parse cache, see ``setParseCache()``
 
   Returns:
     * units: list of strings, channel units  
-    * data: tuple of arrays, channel data
+    * data: tuple of arrays, channel data,
+      or, if blocksize is given, a generator yielding 2d arrays 
+      (1st index for channels) with blocks of data
 
   '''
 # --------------------------------------------------------------------
+  if blocksize is None and not lazy and _useCache(cache, file):
+    units, data = _cachedRead(readPicoScope, file, prlevel=0, dtype=dtype, 
+                              contiguous=contiguous)
+  else:
 #        special treatment to skip/analyze first three lines
-  f = open(file, 'r')
-  line1=f.readline().strip() # remove leading and trailing white space chars
-  line2=f.readline().strip()
-  units=line2         # contains the units
-  line3=f.readline()  # this is an empty line in PicoScope data
-
-  if file.split('.')[1]=="csv":
-    delim=','
-  else:  
-    delim='\t'
-
-  units=units.split(delim)
+    f = _openInput(file)
+    line1=f.readline().strip() # remove leading and trailing white space chars
+    line2=f.readline().strip()
+    units=line2         # contains the units
+    line3=f.readline()  # this is an empty line in PicoScope data
+
+    if _picoCSV(file):
+      delim=','
+    else:  
+      delim='\t'
+
+    units=units.split(delim)
+    if blocksize:  # return generator for blocks of data
+      if prlevel: 
+        print("*==* readPicoScope: %i columns, reading blocks of %i lines"\
+              %(len(units), blocksize))
+      return units, _blockReader(f, blocksize, delim, dtype=dtype, 
+                       ncols=len(units), contiguous=contiguous, close=True)
+    if lazy:  # all channels are read on first access
+      f.close()
+      memo = {}
+      def loader(i):
+        if 'data' not in memo:
+          memo['data'] = readPicoScope(file, dtype=dtype, 
+                           contiguous=contiguous, cache=False)[1]
+        return memo['data'][i]
+      names = line1.split(delim)  # channel names from first header line
+      data = LazyChannelList(names, loader, quantities=names, units=units)
+      if prlevel: 
+        print("*==* readPicoScope: %i columns found, not yet read"%len(units))
+      return units, data
+    data = np.loadtxt(f, dtype=dtype, delimiter=delim, unpack=True)
+    if contiguous: data = np.ascontiguousarray(data)
   nc=len(units)
-  data = np.loadtxt(f, dtype=np.float32, delimiter=delim, unpack=True)
   if prlevel: 
     print("*==* readPicoScope: %i columns found:"%nc)
     if prlevel>1:
@@ -285,14 +632,143 @@ def readPicoScope(file, prlevel=0):
   else:  
     return units, data
 
+def readPicoScopeSegments(files, prlevel=0, nproc=None, dtype=np.float32):
+  '''
+  read a series of waveforms exported from PicoScope in .txt or .csv 
+  format, one file per segment (e.g. in rapid-block mode), into a 
+  single 3d array 
+
+  The header of the first file is analyzed once, the headers of all 
+  other files are checked for consistency; the array for all data is 
+  allocated once and filled with the segments read in parallel 
+  processes, which are passed via shared memory one by one. 
+  
+  Args:
+    * files: list of file names, or string with wildcards, e.g. 'wave_*.txt'
+      (sorted by the numbers in the file names)
+    * prlevel: printout level, 0 means silent
+    * nproc: number of processes (default: number of cpus, 
+      1: read files sequentially in this process)
+    * dtype: data type of result
 
-def readCassy(file, prlevel=0):
+  Returns:
+    * units: list of strings, channel units  
+    * data: 3d array (segments x channels x samples)
+  Raises:
+    * ValueError: if headers, number of channels or samples are 
+      inconsistent
+  '''
+# --------------------------------------------------------------------
+  if type(files)==type(' '):
+    import glob
+    files = sorted(glob.glob(files), key=_naturalKey)
+  # header and number of samples from first file
+  header, d0 = _picoSegment(files[0], dtype=dtype)
+  shape = (len(files),) + d0.shape
+  units = header[1].split(',' if _picoCSV(files[0]) else '\t')
+  if prlevel:
+    print("*==* readPicoScopeSegments: %i segments, %i channels, %i samples"\
+          %shape)
+  if len(units) != shape[1]:
+    raise ValueError(
+      "number of data columns inconsistent with number of units")
+
+  data = np.empty(shape, dtype=dtype)
+  data[0] = d0
+  if nproc == 1 or len(files) < 3 or d0.size == 0:
+    errors = [_picoSegment(fname, header, data[i], dtype)[0] 
+              for i, fname in enumerate(files) if i]
+  else:
+    # segments are copied from shared memory as workers deliver them
+    errors = []
+    tasks = [(fname, header, dtype) for fname in files[1:]]
+    for i, (h, d) in enumerate(_poolMap(_picoSegmentWorker, tasks, nproc)):
+      if type(h) == type(' ') or d is None:
+        errors.append(h)
+        _shmUnpack(d)   # release shared memory
+      elif _shmShape(d) != shape[1:]:
+        errors.append('number of channels or samples inconsistent')
+        _shmUnpack(d) 
+      else:
+        errors.append(h)
+        _shmUnpack(d, out=data[i+1])
+
+  errors = ["%s: %s"%(fname, e) for fname, e in zip(files[1:], errors)
+            if type(e) == type(' ')]
+  if errors:
+    raise ValueError("readPicoScopeSegments: " + '; '.join(errors))
+  return units, data
+
+def _picoSegment(fname, header=None, out=None, dtype=np.float32):
+  '''
+  read one waveform exported from PicoScope for readPicoScopeSegments()
+
+  Args:
+    * fname: string, file name
+    * header: expected header lines (optional)
+    * out: array to store data (optional)
+    * dtype: data type
+  Returns:
+    * header lines, or error message if inconsistent with expectation 
+    * data: 2d array, 1st index for channels 
+  '''
+  with _openInput(fname) as f:
+    h = (f.readline().strip(), f.readline().strip())
+    f.readline()  # this is an empty line in PicoScope data
+    if header is not None and h != tuple(header):
+      return 'header inconsistent with first file', None
+    data = _bulkParse(f.read(), ',' if _picoCSV(fname) else '\t', 
+                      dtype=dtype, ndmin=2)
+  if out is not None:
+    if data.shape != out.shape:
+      return 'number of channels or samples inconsistent', None
+    out[...] = data
+  return h, data
+
+def _picoSegmentWorker(task):
+  '''
+  read one waveform in a worker process of readPicoScopeSegments()
+
+  Args:
+    * task: tuple (file name, header, dtype)
+  Returns:
+    * header lines, or error message
+    * data in shared memory (see ``_shmPack()``), or None 
+  '''
+  fname, header, dtype = task
+  try:
+    h, data = _picoSegment(fname, header, dtype=dtype)
+    return h, _shmPack(data, 0) 
+  except Exception as e:
+    return '%s: %s'%(type(e).__name__, e), None
+
+def _picoCSV(fname):
+  '''PicoScope data in .csv format ? (ignoring suffix of compressed files)'''
+  import os
+  name, ext = os.path.splitext(fname)
+  if ext.lower() in ('.gz', '.bz2', '.xz', '.zip'): 
+    ext = os.path.splitext(name)[1]
+  return ext.lower() == '.csv'
+
+def _naturalKey(s):
+  '''
+  key for sorting strings containing numbers in natural order,
+  e.g. 'wave_2.txt' before 'wave_10.txt'
+  '''
+  import re
+  return [int(w) if w.isdigit() else w for w in re.split(r'(\d+)', s)]
+
+
+def readCassy(file, prlevel=0, channels=None, cache=None):
   '''
   read Data exported from Cassy in .txt format
   
   Args:
     * file: string, file name 
     * prlevel: printout level, 0 means silent
+    * channels: quantity name, symbol or column index of channel(s)
+      to be read, or a list of these (default: all)
+    * cache: use parse cache, see ``setParseCache()``
 
   Returns:
     * units: list of strings, channel units  
@@ -301,8 +777,20 @@ def readCassy(file, prlevel=0):
   '''
 # --------------------------------------------------------------------
   delim='\t'                 # Cassy uses <tab> as column delimiter
-  hlines, data = readtxt(file, nlhead=5, delim=delim)
-  tags = hlines[4].replace('DEF=','').split(delim)
+  if channels is None:
+    hlines, data = readtxt(file, nlhead=5, delim=delim, cache=cache)
+    tags = hlines[4].replace('DEF=','').split(delim)
+  else:
+    # get channel definitions from header and select columns
+    with _openInput(file) as f:
+      lfilt = _specialCharFilter(f, delim)
+      hlines = [next(lfilt) for i in range(5)]
+    tags = hlines[4].replace('DEF=','').split(delim)
+    cols = [i for i, tag in enumerate(tags) 
+            if _selectChannel(channels, i, *_cassyNames(tag))]
+    tags = [tags[i] for i in cols]
+    hlines, data = readtxt(file, nlhead=5, delim=delim, usecols=cols,
+                           cache=cache)
   nc=len(tags)
 
   if prlevel: 
@@ -317,30 +805,116 @@ def readCassy(file, prlevel=0):
   else:  
     return tags, data
 
+def _cassyNames(tag):
+  '''
+  get quantity name and symbol from channel definition in Cassy .txt format
+  
+  Args:
+    * tag: string, channel definition, e.g. '"Zeit" t / s'
+  Returns:
+    * quantity name, symbol
+  '''
+  w=tag.split('"')
+  if len(w)<3: return tag.strip(), ''
+  return w[1], w[2].split('/')[0].strip()
+
+def _selectChannel(channels, i, quantity, symbol):
+  '''
+  check whether a channel is contained in a selection
 
-def labxParser(file, prlevel=1):
+  Args:
+    * channels: None (all channels), or quantity name, symbol 
+      or index of channel, or list of these
+    * i: int, index or number of channel, as used by the caller
+    * quantity: string, name of physical quantity 
+    * symbol: string, symbol of quantity
+  Returns:
+    * bool: True if selected
+  '''
+  if channels is None: return True
+  if type(channels) not in (list, tuple): channels = [channels]
+  return i in channels or quantity in channels or symbol in channels
+
+
+def labxParser(file, prlevel=1, engine='tree', channels=None, lazy=False,
+               runs=False, nproc=1, cache=None):
   '''   
   read files in xml-format produced with Leybold CASSY
    
   Args:
-     * file:  input data in .labx format
+     * file:  input data in .labx format (may be compressed)
      * prlevel: control printout level, 0=no printout
+     * engine: parsing method, 
+       'tree':   read complete xml tree into memory (default),
+       'stream': incremental parsing, constant memory for xml structure,
+       'fast':   bulk conversion of values on byte level, 
+       xml parsing only for header and channel information
+     * channels: quantity name, symbol or number of channel(s) to be 
+       read (numbers starting at 1, as in the returned tags), or a 
+       list of these (default: all); values of other channels are skipped
+     * lazy: if True, only the header and the channel catalog are parsed,
+       values are returned as ``LazyChannelList`` and converted on first
+       access (byte-level method as for engine 'fast')
+     * runs: if True, channels of a quantity measured in several runs
+       (CASSY tag <channels runs="true">) are returned together, as 
+       2d array (runs x values) if all runs have the same number of 
+       values, otherwise as list of arrays (byte-level method as for 
+       engine 'fast')
+     * nproc: number of processes converting values in parallel 
+       (None: number of cpus); for nproc != 1, the byte ranges of all 
+       channels are located first and converted by worker processes
+       (byte-level method as for engine 'fast')
+     * cache: use parse cache, see ``setParseCache()``; 
+       values are returned as np-arrays
  
   Returns:
      * list of strings: tags of measurmement vectors
+       (for runs=True: 'first-last:quantity:symbol:unit' with
+       numbers of first and last channel)
      * 2d list:         measurement vectors read from file 
+       (for engine='stream' or 'fast': list of np-arrays of type float32)
   '''
 # --------------------------------------------------------------------
 # dependencies: xml.etree.ElementTree
 #
 #  30-Oct-16  initial version
 # changes :
+#  18-Oct-26  streaming engine with preallocated arrays
+#             fast engine with bulk conversion of values
+#             selection of channels
+#             parse cache
+#             compressed input
+#             lazy conversion of values
+#             values of runs grouped by quantity
+#             parallel conversion of values
 # --------------------------------------------------------------------
   import xml.etree.ElementTree as ET
   import numpy as np, matplotlib.pyplot as plt
   import sys
 
-  root = ET.parse(file).getroot()
+  if not lazy and _useCache(cache, file):
+    vtags, varray = _cachedRead(labxParser, file, prlevel=0, engine=engine,
+                                channels=channels, runs=runs, nproc=nproc)
+    if (prlevel): 
+      print("*==* labxParser:  %i value lists found in cache"%len(varray))
+      for tag in vtags:
+        print("  ", tag)
+      print("\n\n")
+    return vtags, varray
+
+  if type(file)==type(' ') and _compression(file): # decompress while parsing
+    file = _openInput(file, 'rb')
+  if lazy or runs or nproc != 1:
+    root, vtags, varray, vinfo = _labxFast(file, channels, lazy, runs, nproc)
+  elif engine == 'stream':
+    root, vtags, varray, vinfo = _labxStream(file, channels)
+  elif engine == 'fast':
+    root, vtags, varray, vinfo = _labxFast(file, channels)
+  elif engine == 'tree':
+    root = ET.parse(file).getroot()
+  else:
+    raise ValueError("labxParser: unknown engine '%s'"%(engine))
+
   if root.tag != 'cassylab':
     print(" !!! only cassylab supported - exiting (1) !")
     sys.exit(1)    
@@ -393,57 +967,769 @@ def labxParser(file, prlevel=1):
 # ---- collect data in vectors 
   # cassylab stores data under the tag "channels:channel:values", 
   #    search for and extract data from xml structure
+  if engine == 'tree' and not (lazy or runs or nproc != 1):
+    varray=[]
+    vtags=[]
+    vinfo=[]
+    ic=0
+    for clist in root.iter('channels'):
+      for c in clist:
+        ic+=1
+        if not _labxSelected(channels, ic, c): continue
+        vtags.append(_labxTag(ic, c))
+        values=c.find('values')
+        vinfo.append((c.attrib, values.attrib))
+        varray.append([])
+        for v in values:
+          varray[-1].append(np.float32(v.text))
+
+  if(prlevel>1): 
+    for vtag, (cattrib, vattrib) in zip(vtags, vinfo):
+      print("   --> new channel found", vtag) 
+      if(prlevel>2): 
+        print("     ", cattrib)
+        print("     number of values: ", vattrib)
+
+  if (prlevel): 
+    print("*==* labxParser:  %i value lists found"%len(varray))
+    for tag in vtags:
+      print("  ", tag)
+    print("\n\n")
+
+  return vtags, varray
+
+def _labxTag(ic, c):
+  '''
+  construct tag 'index:quantity:symbol:unit' of a channel in .labx format
+
+  Args:
+    * ic: int, channel number (starting at 1)
+    * c: xml element <channel>
+  Returns:
+    * string: channel tag
+  '''
+  quantity=c.find('quantity').text
+  symbol=c.find('symbol').text
+  if symbol is None: symbol=''
+  unit=c.find('unit').text
+  if unit is None: unit=''
+  return '%i:'%ic + quantity + ':' + symbol + ':' + unit
+
+def _labxSelected(channels, ic, c):
+  '''
+  check whether a channel in .labx format is contained in a selection
+
+  Args:
+    * channels: selection of channels, see ``_selectChannel()``
+    * ic: int, channel number (starting at 1)
+    * c: xml element <channel>
+  Returns:
+    * bool: True if selected
+  '''
+  if channels is None: return True
+  symbol=c.find('symbol').text
+  if symbol is None: symbol=''
+  return _selectChannel(channels, ic, c.find('quantity').text, symbol)
+
+def _labxStream(file, channels=None):
+  '''
+  incremental parsing of a file in .labx format;
+    values are filled into arrays preallocated according to 
+    attribute 'count' of tag <values>; the xml elements of the 
+    values are discarded as soon as they have been converted, 
+    so memory usage is independent of the size of the xml structure
+ 
+  Args:
+    * file: file name or file object 
+    * channels: selection of channels, see ``_selectChannel()``
+  Returns:
+    * root: xml root element, holding only header information
+    * vtags: list of channel tags
+    * varray: list of np-arrays (float32) with channel data
+    * vinfo: list of tuples with attributes of <channel> and <values>
+  '''
+  import xml.etree.ElementTree as ET
+
+  vtags=[]
   varray=[]
-  vnames=[]
-  vsymbols=[]
-  vunits=[]
+  vinfo=[]
+  ic=0
+  stack=[]
+  vals=None
+  for event, elem in ET.iterparse(file, events=('start', 'end')):
+    if event == 'start':
+      stack.append(elem)
+      if elem.tag == 'channel' and stack[-2].tag == 'channels':
+        ic+=1
+      elif elem.tag == 'values' and stack[-2].tag == 'channel':
+        # quantity and symbol precede values, channel selection known
+        if _labxSelected(channels, ic, stack[-2]):
+          vattrib = dict(elem.attrib)
+          vals = np.empty(int(elem.get('count', 0)), dtype=np.float32)
+          nv = 0
+      continue
+
+    stack.pop()
+    if elem.tag == 'value':
+      if vals is not None:
+        if nv == len(vals): # inconsistent count attribute, enlarge array
+          vals = np.resize(vals, 2*nv+1)
+        vals[nv] = np.float32(elem.text)
+        nv += 1
+      stack[-1].clear() # free element just converted
+    elif elem.tag == 'channel' and stack and stack[-1].tag == 'channels':
+      if vals is not None:
+        vtags.append(_labxTag(ic, elem))
+        vinfo.append((dict(elem.attrib), vattrib))
+        varray.append(vals[:nv] if nv == len(vals) else vals[:nv].copy())
+        vals = None
+      stack[-1].remove(elem)  # free memory of channel subtree
+      elem.clear()
+
+  return elem, vtags, varray, vinfo
+
+
+def _labxFast(file, channels=None, lazy=False, runs=False, nproc=1):
+  '''
+  fast parsing of a file in .labx format on byte level:
+    the contents of each <values> block are converted to an
+    np-array in one bulk step, only the remaining (small) xml 
+    structure with header and channel information is parsed 
+    as element tree
+ 
+  Args:
+    * file: file name or file object 
+    * channels: selection of channels, see ``_selectChannel()``
+    * lazy: if True, return LazyChannelList, values converted on access
+    * runs: if True, group channels of runs, see ``labxParser()``
+    * nproc: number of processes converting values (None: number of cpus)
+  Returns:
+    * root: xml root element, without contents of <values>
+    * vtags: list of channel tags
+    * varray: list of np-arrays (float32) with channel data
+    * vinfo: list of tuples with attributes of <channel> and <values>
+  '''
+  import xml.etree.ElementTree as ET
+  import mmap
+
+  fname = file if type(file)==type(' ') else None
+  if type(file)==type(' '): 
+    with open(file, 'rb') as f: # map file to memory, read on demand
+      buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  else:
+    buf = file.read()
+
+  # locate <values> blocks, keep everything else for the xml parser
+  head=[]
+  blocks=[]
+  pos=0
+  i=buf.find(b'<values')
+  while i >= 0:
+    if buf[i+7:i+8] not in (b' ', b'>', b'/', b'\t', b'\r', b'\n'):
+      i=buf.find(b'<values', i+7)   # other tag starting with "values"
+      continue
+    j=buf.find(b'>', i)
+    if buf[j-1:j] == b'/':          # empty element <values ... />
+      opentag=buf[i:j-1].rstrip()
+      k=e=j+1
+    else:
+      opentag=buf[i:j]
+      k=buf.find(b'</values>', j)
+      e=k+9
+    head.append(buf[pos:i])
+    head.append(opentag + (' ppk_block="%i" />'%len(blocks)).encode())
+    blocks.append((j+1, k))
+    pos=e
+    i=buf.find(b'<values', pos)
+  head.append(buf[pos:])
+  root = ET.fromstring(b''.join(head))
+
   vtags=[]
-  iv=0
+  varray=[]
+  vinfo=[]
+  vblocks=[]
+  vquant=[]
+  vgroup=[]
   ic=0
-  for clist in root.iter('channels'):
+  for ig, clist in enumerate(root.iter('channels')):
     for c in clist:
       ic+=1
-      quantity=c.find('quantity').text
-      vnames.append(quantity)
-      symbol=c.find('symbol').text
-      if symbol is None: symbol=''
-      vsymbols.append(symbol)
-      unit=c.find('unit').text
-      if unit is None: unit=''
-      vunits.append(unit)
-      vtag = '%i:'%ic + quantity + ':' + symbol + ':' + unit
-      vtags.append(vtag)
-      if(prlevel>1): 
-        print("   --> new channel found", vtag) 
-        if(prlevel>2): print("     ", c.attrib)
-
+      if not _labxSelected(channels, ic, c): continue # values not touched
+      vtags.append(_labxTag(ic, c))
       values=c.find('values')
-      if(prlevel>2): print("     number of values: ", values.attrib)
-      varray.append([])
-      for v in values:
-        varray[iv].append(np.float32(v.text))
-      iv+=1
+      ib=int(values.attrib.pop('ppk_block'))
+      vinfo.append((c.attrib, values.attrib))
+      vblocks.append(blocks[ib])
+      vquant.append((c.find('quantity').text, c.find('unit').text or ''))
+      vgroup.append((ig, ic, clist))
+  if not (lazy or runs):
+    if nproc != 1 and fname is not None and len(vblocks) > 1: 
+      varray = _labxParallel(fname, vblocks, nproc)
+    else:
+      varray = [_labxValues(buf[a:b]) for a, b in vblocks]
+
+  if runs: # one entry per group of channels, i.e. quantity in all runs
+    rtags=[]
+    rinfo=[]
+    for ig in sorted(set([g[0] for g in vgroup])):
+      idx=[i for i, g in enumerate(vgroup) if g[0] == ig]
+      clist=vgroup[idx[0]][2]
+      if clist.get('runs') != 'true': # not a group of runs, keep channels
+        for i in idx:
+          rtags.append(vtags[i])
+          rinfo.append(vinfo[i])
+          varray.append(_labxValues(buf[vblocks[i][0]:vblocks[i][1]]))
+        continue
+      rtags.append('%i-%i:'%(vgroup[idx[0]][1], vgroup[idx[-1]][1]) 
+                   + vtags[idx[0]].split(':', 1)[1])
+      rinfo.append((dict(clist.attrib), vinfo[idx[0]][1]))
+      # fill 2d array if numbers of values agree
+      counts=set([vinfo[i][1].get('count') for i in idx])
+      vals=None
+      if len(counts) == 1 and None not in counts:
+        vals=np.empty((len(idx), int(counts.pop())), dtype=np.float32)
+        for j, i in enumerate(idx):
+          if _labxValues(buf[vblocks[i][0]:vblocks[i][1]], out=vals[j]) is None:
+            vals=None  # inconsistent count attribute
+            break
+      if vals is None:
+        vals=[_labxValues(buf[vblocks[i][0]:vblocks[i][1]]) for i in idx]
+      varray.append(vals)
+    return root, rtags, varray, rinfo
+
+  if lazy: # buf is kept for conversion of values on first access
+    varray = LazyChannelList(vtags, 
+      lambda i: _labxValues(buf[vblocks[i][0]:vblocks[i][1]]),
+      quantities=[q for q, u in vquant], units=[u for q, u in vquant],
+      counts=[int(va.get('count', 0)) for ca, va in vinfo])
+  return root, vtags, varray, vinfo
+
+def _labxValues(block, out=None):
+  '''
+  convert contents of a <values> block in .labx format to np-array 
 
-  if (prlevel): 
-    print("*==* labxParser:  %i value lists found"%iv)
-    for tag in vtags:
-      print("  ", tag)
-    print("\n\n")
+  Args:
+    * block: bytes, text between <values> and </values>
+    * out: np-array to store values (optional)
+  Returns:
+    * np-array of type float32, 
+      None if number of values does not match size of out
+  '''
+  if not block.strip(): 
+    if out is not None: return out if len(out) == 0 else None
+    return np.zeros(0, dtype=np.float32)
+  # empty <value /> elements are converted to nan, like in xml parser
+  if b'<value />' in block: block=block.replace(b'<value />', b'<value>nan</value>')
+  if b'<value/>' in block: block=block.replace(b'<value/>', b'<value>nan</value>')
+  # split at element boundaries and convert all strings in one step
+  #  (via double precision, as np.float32(string) does)
+  v=block.strip().split(b'</value><value>')
+  if len(v) == block.count(b'<value>'):
+    v[0]=v[0][7:]    # remove leading <value>
+    v[-1]=v[-1][:-8] # remove trailing </value>
+  else: # white space between elements
+    v=block.replace(b'</value>', b' ').replace(b'<value>', b' ').split()
+  if out is not None:
+    if len(v) != len(out): return None
+    out[...] = np.array(v, dtype=np.float64)
+    return out
+  return np.array(v, dtype=np.float64).astype(np.float32)
+
+def _labxParallel(fname, vblocks, nproc=None, shmlimit=1.e5):
+  '''
+  convert <values> blocks of a file in .labx format in parallel 
+  processes; each worker reads its byte range directly from the 
+  file, arrays are passed back via shared memory 
 
-  return vtags, varray
+  Args:
+    * fname: string, file name 
+    * vblocks: list of tuples, byte ranges of <values> blocks
+    * nproc: number of processes (None: number of cpus)
+    * shmlimit: minimal size (bytes) of arrays passed via shared memory
+  Returns:
+    * list of np-arrays (float32), in order of vblocks
+  '''
+  # largest blocks first for even load of workers
+  order = sorted(range(len(vblocks)), 
+                 key=lambda i: vblocks[i][0] - vblocks[i][1])
+  output = _poolMap(_labxValuesWorker, 
+    [(fname, vblocks[i][0], vblocks[i][1], shmlimit) for i in order], nproc)
+  varray = [None]*len(vblocks)
+  for i, v in zip(order, output):
+    varray[i] = _shmUnpack(v)
+  return varray
+
+def _labxValuesWorker(task):
+  '''
+  convert one <values> block in a worker process of _labxParallel()
+
+  Args:
+    * task: tuple (file name, first byte, last byte, shmlimit)
+  Returns:
+    * np-array, or reference to copy in shared memory
+  '''
+  fname, a, b, shmlimit = task
+  with open(fname, 'rb') as f:
+    f.seek(a)
+    block = f.read(b - a)
+  return _shmPack(_labxValues(block), shmlimit)
+
+class LazyChannelList(object):
+  '''
+  list of channel data with conversion of values on first access;
+  returned by ``labxParser()`` and ``readPicoScope()`` with option 
+  lazy=True. The channel catalog is available without converting
+  any values; converted channels are kept. 
+
+  Behaves like a list of np-arrays: ``len(c)``, ``c[i]`` (array, 
+  slicing of the array does not copy values), ``c[i:j]`` (list of 
+  arrays), iteration, ``np.array(c)``  
+
+  Attributes:
+    * tags: list of channel tags 
+    * quantities: list of names of quantities
+    * units: list of units
+    * counts: list of numbers of values (None if not known)
+  '''
+
+  def __init__(self, tags, loader, quantities=None, units=None, counts=None):
+    '''
+    Args:
+      * tags: list of channel tags
+      * loader: function returning values of channel i as np-array
+      * quantities, units, counts: lists with channel information
+    '''
+    n = len(tags)
+    self.tags = list(tags)
+    self.quantities = list(quantities) if quantities else ['']*n
+    self.units = list(units) if units else ['']*n
+    self.counts = list(counts) if counts else [None]*n
+    self._loader = loader
+    self._values = [None]*n
+
+  def __len__(self):
+    return len(self.tags)
+
+  def __getitem__(self, i):
+    if isinstance(i, slice):
+      return [self[j] for j in range(*i.indices(len(self)))]
+    if i < 0: i += len(self)
+    if not 0 <= i < len(self): raise IndexError('channel index out of range')
+    if self._values[i] is None: # convert on first access
+      self._values[i] = self._loader(i)
+    return self._values[i]
+
+  def __iter__(self):
+    for i in range(len(self)):
+      yield self[i]
+
+  def isLoaded(self, i):
+    '''True if values of channel i have been converted'''
+    return self._values[i] is not None
+
+  def __repr__(self):
+    return '<LazyChannelList: %i channels, %i converted>'%(len(self), 
+      len([v for v in self._values if v is not None]))
+
+
+def readAny(file, prlevel=0, **kwargs):
+  '''
+  read a file with the input function appropriate for its format:
+  the format is determined from the first kilobytes of the file 
+  (CASSY .labx or .txt, PicoScope .txt or .csv, general .csv or .txt 
+  with header lines, column data with comments and keywords as for 
+  ``readColumnData()``); the result of the detection is kept for 
+  files with unchanged size and modification time
+
+  Args:
+    * file: string, file name
+    * prlevel: printout level, 0 means silent
+    * kwargs: further arguments for the input function, e.g. cache=True
+  Returns:
+    * fmt: string, detected format, one of 
+      'labx', 'cassy', 'picoscope', 'columns', 'csv', 'txt'
+    * header information and data, as returned by the input function
+  Raises:
+    * ValueError: if the format is not recognized
+  '''
+# --------------------------------------------------------------------
+  import os
+  st = os.stat(file)
+  sig = (os.path.abspath(file), st.st_size, st.st_mtime)
+  if sig not in _formatCache:
+    _formatCache[sig] = _sniffFormat(file)
+  fmt, args = _formatCache[sig]
+  if fmt is None:
+    raise ValueError("readAny: format of file %s not recognized"%file)
+  args = dict(args)
+  args.update(kwargs)
+  if fmt == 'labx':
+    hinfo, data = labxParser(file, prlevel=prlevel, **args)
+  elif fmt == 'cassy':
+    hinfo, data = readCassy(file, prlevel=prlevel, **args)
+  elif fmt == 'picoscope':
+    hinfo, data = readPicoScope(file, prlevel=prlevel, **args)
+  elif fmt == 'columns':
+    data, hinfo = readColumnData(file, pr=prlevel>0, **args)
+  elif fmt == 'csv':
+    hinfo, data = readCSV(file, **args)
+  else:
+    hinfo, data = readtxt(file, **args)
+  if prlevel:
+    print("*==* readAny: %s read as '%s' with arguments %s"%(file, fmt, args))
+  return fmt, hinfo, data
 
+_formatCache = {} # detected formats, key (file name, size, modification time)
+
+def _sniffFormat(file):
+  '''
+  detect format of an input file from its first 4 kB
 
-def writeCSV(file, ldata, hlines=[], fmt='%.10g', delim=',', nline='\n', **kwargs):
+  Args:
+    * file: string, file name
+  Returns:
+    * fmt: string, format (see readAny()), None if not recognized 
+    * dictionary with arguments for input function (nlhead, delim)
+  '''
+  f = _openInput(file, 'rb')
+  head = f.read(4096)
+  f.close()
+  if head.startswith(b'\xef\xbb\xbf'): head = head[3:] # utf-8 BOM
+  if b'<cassylab' in head: 
+    return 'labx', {}
+  rlines = head.decode('latin-1').split('\n')
+  if len(head) == 4096: rlines = rlines[:-1] # last line may be incomplete
+  ctrl = dict([(i, None) for i in range(32) if chr(i) != '\t'])
+  lines = [l.translate(ctrl).strip() for l in rlines]
+  if [l for l in lines[:5] if l.startswith('MIN=') or l.startswith('DEF=')]:
+    return 'cassy', {}
+  # PicoScope: names, units in brackets, empty line
+  if len(lines) > 3 and lines[1].startswith('(') and lines[1].endswith(')') \
+     and lines[2] == '' and (',' in lines[1]) == _picoCSV(file):
+    return 'picoscope', {}
+
+  def numbers(l, delim):
+    try:
+      [float(w) for w in (l.split(delim) if delim else l.split())]
+      return True
+    except ValueError:
+      return False
+
+  # first line with numbers only, comments and keywords as in readColumnData
+  comments = False
+  nempty = 0
+  for i, l in enumerate(lines):
+    if l == '': 
+      nempty += 1
+      continue
+    if l[0] in '#*': 
+      comments = True
+      continue
+    l = l.split('#')[0].strip() if comments else l
+    for delim in ('\t', ';', ',', None):
+      if delim is None or delim in l: break
+    if not numbers(l if delim == ',' else l.replace(',', '.'), delim):
+      continue
+    if comments or (delim is None and i == 0):
+      return 'columns', {'delimiter': delim} if delim else {}
+    if delim == ',':
+      return 'csv', {'nlhead': i}
+    # readtxt() does not count empty lines in header 
+    # white space: any number of blanks or tabs separates columns
+    return 'txt', {'nlhead': i - nempty, 'delim': delim}
+  return None, {}
+
+def readMany(files, reader, nproc=None, stack=False, shmlimit=1.e6, 
+             **kwargs):
+  '''
+  read many files with one of the input functions of PhyPraKit, 
+  using a pool of parallel processes
+
+  Large arrays are passed back from the worker processes via 
+  shared memory (python >= 3.8), avoiding pickling overhead. 
+  Errors are captured file by file, so that a damaged file does
+  not stop the processing of the others. 
+
+  Args:
+    * files: list of file names, or string with wildcards, e.g. 'data/*.txt'
+    * reader: input function, e.g. readPicoScope or labxParser
+    * nproc: number of processes (default: number of cpus, 
+      1: read files sequentially in this process)
+    * stack: if True, stack data of all files in one array
+    * shmlimit: minimal size (bytes) of arrays passed via shared memory
+    * kwargs: further arguments for reader, e.g. prlevel=0 or nlhead=2
+
+  Returns:
+    * results: list of results of reader (None for failed files), 
+      in the order of the input files; 
+      if stack is True: tuple (list of header information, i.e. 
+      header lines, units, tags or meta-data, array of shape 
+      (files, columns, values) with data of all successfully read files,
+      empty if no file could be read)
+    * errors: dictionary {file name: error message} of failed files
+  '''
+# --------------------------------------------------------------------
+  if type(files)==type(' '):
+    import glob
+    files = sorted(glob.glob(files))
+  tasks = [(reader, fname, kwargs, shmlimit) for fname in files]
+  if nproc == 1 or len(files) < 2:
+    output = [_readManyWorker(task[:3] + (None,)) for task in tasks]
+  else:
+    output = list(_poolMap(_readManyWorker, tasks, nproc))
+  return _readManyResults(files, output, stack, reader)
+
+def _readManyResults(files, output, stack=False, reader=None):
+  '''
+  collect results of workers of readMany() and readManyAsync()
+
+  Args:
+    * files: list of file names
+    * output: list of tuples (status, result) returned by _readManyWorker()
+    * stack: if True, stack data of all files in one array
+    * reader: input function, determines position of data in results
+  Returns:
+    * results, errors: as for readMany()
+  '''
+  results = []
+  errors = {}
+  for fname, (status, res) in zip(files, output):
+    if status == 'ok':
+      results.append(_shmUnpack(res))
+    else:
+      results.append(None)
+      errors[fname] = res
+      print("  !!! readMany: reading %s failed: %s"%(fname, res))
+  if stack:
+    # position of data in result of reader, header information 
+    idata = {'readColumnData': 0, 'readAny': 2}.get(
+      getattr(reader, '__name__', None), 1)
+    ihead = 1 if idata == 0 else idata-1
+    good = [r for r in results if r is not None]
+    if good:
+      results = ([r[ihead] for r in good], 
+                 np.stack([np.asarray(r[idata]) for r in good]))
+    else:  # no file read successfully
+      results = ([], np.zeros(0))
+  return results, errors
+
+def readAsync(file, reader, executor=None, **kwargs):
+  '''
+  asynchronous version of the input functions, for applications based 
+  on asyncio: returns immediately, file input and parsing are done in 
+  an executor, so that the event loop is not blocked
+
+  Example: ``units, data = await readAsync('data.txt', readPicoScope)``
+  (to be called while the event loop is running)
+
+  Args:
+    * file: string, file name
+    * reader: input function, e.g. readPicoScope or labxParser
+    * executor: concurrent.futures executor (default: 
+      default executor of event loop, i.e. a pool of threads)
+    * kwargs: further arguments for reader
+  Returns:
+    * asyncio future, result as returned by reader
+  '''
+  import asyncio, functools
+  loop = asyncio.get_event_loop()
+  return loop.run_in_executor(executor, 
+                              functools.partial(reader, file, **kwargs))
+
+def readManyAsync(files, reader, nproc=4, processes=True, stack=False,
+                  shmlimit=1.e6, **kwargs):
+  '''
+  asynchronous version of ``readMany()``, for applications based on 
+  asyncio: returns immediately, the files are read and parsed in a 
+  pool of at most nproc processes (or threads), so that the event loop 
+  is not blocked and the number of files processed concurrently is 
+  bounded
+
+  Example: ``results, errors = await readManyAsync('data/*.labx', 
+  labxParser, prlevel=0)`` (to be called while the event loop is running)
+
+  Args:
+    * files: list of file names, or string with wildcards, e.g. 'data/*.txt'
+    * reader: input function, e.g. readPicoScope or labxParser
+    * nproc: maximum number of files processed concurrently
+    * processes: if True, use processes (parsing in parallel),
+      otherwise threads 
+    * stack: if True, stack data of all files in one array
+    * shmlimit: minimal size (bytes) of arrays passed via shared memory
+    * kwargs: further arguments for reader
+
+  Returns:
+    * asyncio future, result (results, errors) as for ``readMany()``
+  '''
+  import asyncio, concurrent.futures
+  if type(files)==type(' '):
+    import glob
+    files = sorted(glob.glob(files))
+  loop = asyncio.get_event_loop()
+  if processes:
+    _shmTracker()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=nproc)
+  else:
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=nproc)
+    shmlimit = None  # threads share memory, nothing to transfer
+  output = asyncio.gather(*[loop.run_in_executor(executor, _readManyWorker,
+                            (reader, fname, kwargs, shmlimit)) 
+                            for fname in files])
+  result = loop.create_future()
+  def done(output):
+    executor.shutdown(wait=False)
+    if output.cancelled():
+      result.cancel()
+    elif output.exception() is not None:
+      result.set_exception(output.exception())
+    else:
+      result.set_result(_readManyResults(files, output.result(), stack, 
+                                         reader))
+  output.add_done_callback(done)
+  return result
+
+def _readManyWorker(task):
+  '''
+  read one file in a worker process of readMany()
+
+  Args:
+    * task: tuple (reader, file name, dict with kwargs, shmlimit)
+  Returns:
+    * status: 'ok' or 'error'
+    * result of reader, large arrays in shared memory, or error message
+  '''
+  reader, fname, kwargs, shmlimit = task
+  try:
+    return 'ok', _shmPack(reader(fname, **kwargs), shmlimit)
+  except SystemExit as e: # input functions exit on inconsistent input
+    return 'error', 'exit code %s'%e.code
+  except Exception as e:
+    return 'error', '%s: %s'%(type(e).__name__, e)
+
+def _shmPack(obj, shmlimit):
+  '''
+  replace large np-arrays in (nested lists or tuples of) results by 
+  references to copies in shared memory
+
+  Args:
+    * obj: result of input function
+    * shmlimit: minimal size of arrays in bytes, None for no action 
+  Returns:
+    * obj with arrays replaced by tuples ('ppk_shm', name, shape, dtype)
+  '''
+  if shmlimit is None: return obj
+  if isinstance(obj, np.ndarray):
+    if obj.nbytes < max(shmlimit, 1): return obj
+    try:
+      from multiprocessing import shared_memory
+    except ImportError: # python < 3.8, arrays are pickled 
+      return obj
+    shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+    np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+    ref = ('ppk_shm', shm.name, obj.shape, obj.dtype.str)
+    shm.close()
+    return ref
+  if type(obj) in (list, tuple):
+    return type(obj)([_shmPack(o, shmlimit) for o in obj])
+  return obj
+
+def _shmUnpack(obj, out=None):
+  '''
+  copy np-arrays back from shared memory and release it, 
+  inverse of _shmPack()
+
+  Args:
+    * obj: result of _shmPack()
+    * out: np-array to store a single array (optional)
+  '''
+  if type(obj) is tuple and len(obj) == 4 and obj[0] == 'ppk_shm':
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=obj[1])
+    try:
+      a = np.ndarray(obj[2], dtype=obj[3], buffer=shm.buf)
+      if out is None: 
+        a = a.copy()
+      else:
+        out[...] = a
+        a = out
+    finally:
+      shm.close()
+      shm.unlink()
+    return a
+  if out is not None and isinstance(obj, np.ndarray):
+    out[...] = obj
+    return out
+  if type(obj) in (list, tuple):
+    return type(obj)([_shmUnpack(o) for o in obj])
+  return obj
+
+def _shmShape(obj):
+  '''shape of an np-array, or of its copy in shared memory'''
+  if type(obj) is tuple and len(obj) == 4 and obj[0] == 'ppk_shm':
+    return tuple(obj[2])
+  return np.shape(obj)
+
+def _shmTracker():
+  '''
+  start the resource tracker of multiprocessing before workers are 
+  created, so that shared memory of all workers is tracked by one 
+  tracker (python >= 3.8)
+  '''
+  try:
+    from multiprocessing import resource_tracker
+    resource_tracker.ensure_running()
+  except ImportError:
+    pass
+
+def _poolMap(worker, tasks, nproc=None):
+  '''
+  generator: results of worker for all tasks, computed in a pool of 
+  processes and returned in the order of tasks; the pool is closed 
+  when all results are delivered (or the generator is closed)
+
+  Args:
+    * worker: function of one argument, task
+    * tasks: list of tasks
+    * nproc: number of processes (default: number of cpus)
+  Yields:
+    * result of worker for each task
+  '''
+  import multiprocessing
+  if nproc is None: nproc = multiprocessing.cpu_count()
+  _shmTracker()
+  pool = multiprocessing.Pool(max(1, min(nproc, len(tasks))))
+  try:
+    for result in pool.imap(worker, tasks, chunksize=1):
+      yield result
+  finally:
+    pool.close()
+    pool.join()
+
+
+def writeCSV(file, ldata, hlines=[], fmt='%.10g', delim=',', nline='\n', 
+             blocksize=10000, compress=None, **kwargs):
   '''
   write data in .csv format, including header lines
   
+  rows are formatted and written in blocks directly from the columns,
+  without building a transposed copy of all data; data may also be 
+  passed as an iterator over blocks, e.g. from the block-wise readers 
+  (option blocksize of ``readCSV()``, ``readtxt()``, ``readPicoScope()``),
+  so that the complete data set is never in memory
+  
   Args:
     * file: string, file name 
-    * ldata: list of columns to be written
+    * ldata: list of columns to be written, 
+      or iterator yielding lists of columns (or 2d arrays, 
+      1st index for columns) with consecutive blocks of rows
     * hlines: list with header lines (optional)
     * fmt: format string (optional)
     * delim: delimiter to seperate values (default comma)
     * nline: newline string (default: \n)
+    * blocksize: number of rows formatted in one step
+    * compress: 'gzip', 'bz2' or 'xz' to compress output; 
+      default: as indicated by file name ending .gz, .bz2 or .xz
+    * kwargs: header, footer, comments as for ``numpy.savetxt()``
 
   Returns: 
     * 0/1  for success/fail
@@ -452,7 +1738,7 @@ def writeCSV(file, ldata, hlines=[], fmt='%.10g', delim=',', nline='\n', **kwarg
 # --------------------------------------------------------------------
 
   # open file for read (if necessary)
-  if type(file)==type(' '): f = open(file, 'w') # file is a file name
+  if type(file)==type(' '): f = _openOutput(file, compress) # file is a file name
   else: f=file     # assume input is file handle of an open file 
   
   #check if \n is contained in newline, if not add it
@@ -466,11 +1752,90 @@ def writeCSV(file, ldata, hlines=[], fmt='%.10g', delim=',', nline='\n', **kwarg
       f.write(hlines[i]+nline)
 
   try:
-    np.savetxt(f, np.array(ldata).transpose(),
-                fmt=fmt, delimiter=delim, newline=nline, **kwargs)
+    if set(kwargs) - set(['header', 'footer', 'comments']) or \
+       (hasattr(ldata, '__len__') and any([np.iscomplexobj(c) for c in ldata])):
+      # other options of np.savetxt() or complex data, data must be complete
+      np.savetxt(f, np.array(ldata).transpose(),
+                  fmt=fmt, delimiter=delim, newline=nline, **kwargs)
+      return 0
+    comments = kwargs.get('comments', '# ')
+    if kwargs.get('header'):
+      f.write(comments + kwargs['header'].replace('\n', '\n' + comments) 
+              + nline)
+    if hasattr(ldata, '__len__'): ldata = [ldata]  # only one block
+    for block in ldata:
+      _writeRows(f, block, fmt, delim, nline, blocksize)
+    if kwargs.get('footer'):
+      f.write(comments + kwargs['footer'].replace('\n', '\n' + comments)
+              + nline)
     return 0
   except:
     return 1
+  finally:
+    if f is not file: f.close() # flush output to file
+
+def _writeRows(f, ldata, fmt, delim, nline, blocksize):
+  '''
+  format and write rows of data, as np.savetxt() does, in blocks of rows 
+
+  Args:
+    * f: file handle 
+    * ldata: list of columns (or 2d array, 1st index for columns)
+    * fmt: format string, one for all columns or one per column,
+      or list of format strings
+    * delim: delimiter to seperate values 
+    * nline: newline string
+    * blocksize: number of rows formatted in one step
+  '''
+  cols = [np.asarray(c) for c in ldata]
+  if len(cols) == 0: return
+  if min([c.ndim for c in cols]) == 0: # a single column
+    cols = [np.asarray(ldata)]
+  if len(set([len(c) for c in cols])) != 1:
+    raise ValueError('columns of different length')
+  ncol = len(cols)
+  # format of one row, as in np.savetxt()
+  if type(fmt) in (list, tuple):
+    if len(fmt) != ncol: raise ValueError('fmt has wrong number of formats')
+    rowfmt = delim.join(fmt)
+  elif fmt.count('%') == 1:
+    rowfmt = delim.join([fmt]*ncol)
+  elif fmt.count('%') < ncol:
+    raise ValueError('fmt has wrong number of % formats')
+  else:
+    rowfmt = fmt
+  rowfmt += nline
+  for i in range(0, len(cols[0]), blocksize):
+    # values of block in row order, converted to python numbers
+    block = np.column_stack([c[i:i+blocksize] for c in cols])
+    f.write((rowfmt*len(block)) % tuple(block.ravel().tolist()))
+
+def _openOutput(fname, compress=None):
+  '''
+  open file for text output, optionally compressed
+
+  Args:
+    * fname: string, file name
+    * compress: 'gzip', 'bz2', 'xz' or None; 
+      default: as indicated by file name ending .gz, .bz2 or .xz
+  Returns:
+    * file object
+  '''
+  if compress is None:
+    for comp, ext in (('gzip', '.gz'), ('bz2', '.bz2'), ('xz', '.xz')):
+      if fname.endswith(ext): compress = comp
+  if compress is None: 
+    return open(fname, 'w')
+  if compress == 'gzip':
+    import gzip
+    return gzip.open(fname, 'wt')
+  elif compress == 'bz2':
+    import bz2
+    return bz2.open(fname, 'wt')
+  elif compress == 'xz':
+    import lzma
+    return lzma.open(fname, 'wt')
+  raise ValueError('unknown compression ' + str(compress))
 
 def writeTexTable(file, ldata, cnames=[], fmt='%.10g'):
   ''' write data formatted as latex tabular
@@ -502,6 +1867,589 @@ def writeTexTable(file, ldata, cnames=[], fmt='%.10g'):
   return writeCSV(file, ldata, fmt=fmt, delim=delim, nline=nline,
                   header=head, footer=foot, comments='')
 
+_ppkBinMagic = b'PPKBIN01'  # identifies files written by writeBinary()
+
+def writeBinary(file, ldata, hlines=[], names=None, units=None, meta=None):
+  '''
+  write data in binary, column-oriented format, including header lines,
+  column names, units and meta-data; the columns are written one by 
+  one, without formatting and without building a transposed array, 
+  and can be read back memory-mapped with ``readBinary()``
+
+  File layout: 8 bytes 'PPKBIN01', length of header (8 bytes, 
+  little endian), header in json format, columns in binary 
+  representation, each starting at a multiple of 64 bytes
+
+  Args:
+    * file: string, file name 
+    * ldata: list of columns to be written 
+      (numerical data of any type and length)
+    * hlines: list with header lines (optional)
+    * names: list of column names (optional)
+    * units: list of column units (optional)
+    * meta: dictionary with further meta-data (optional, json-serializable)
+
+  Returns: 
+    * 0/1  for success/fail
+
+  '''
+# --------------------------------------------------------------------
+  import json, struct
+  if type(hlines)==type(' '): hlines=[hlines]
+  cols = [np.asarray(c) for c in ldata]
+  # column descriptions, offsets relative to start of data
+  cdefs = []
+  offset = 0
+  for i, c in enumerate(cols):
+    if c.dtype.hasobject:
+      print("  !!! writeBinary: only numerical data supported")
+      return 1
+    cdefs.append({'name': names[i] if names else '',
+                  'unit': units[i] if units else '',
+                  'dtype': c.dtype.str, 'shape': c.shape, 'offset': offset})
+    offset += -(-c.nbytes//64)*64
+  header = json.dumps({'hlines': list(hlines), 'columns': cdefs,
+                       'meta': meta if meta else {}}).encode('utf-8')
+  dstart = -(-(16 + len(header))//64)*64
+  try:
+    with open(file, 'wb') as f:
+      f.write(_ppkBinMagic + struct.pack('<Q', len(header)) + header)
+      for c, cdef in zip(cols, cdefs):
+        f.write(b'\0'*(dstart + cdef['offset'] - f.tell())) # alignment
+        f.write(np.ascontiguousarray(c).data)
+    return 0
+  except Exception:
+    return 1
+
+def readBinary(file, mmap=True):
+  '''
+  read data in binary format written by ``writeBinary()``
+  
+  Args:
+    * file: string, file name 
+    * mmap: if True, columns are memory-mapped (read-only, no copy)
+
+  Returns:
+    * hlines: list of string, header lines
+    * data: list of arrays, column data
+    * meta: dictionary with meta-data, including lists 'names' 
+      and 'units' of columns 
+  Raises:
+    * ValueError: if file is not in PhyPraKit binary format
+
+  '''
+# --------------------------------------------------------------------
+  import json, struct
+  with open(file, 'rb') as f:
+    if f.read(8) != _ppkBinMagic:
+      raise ValueError("readBinary: %s not in PhyPraKit binary format"%file)
+    hlen = struct.unpack('<Q', f.read(8))[0]
+    header = json.loads(f.read(hlen).decode('utf-8'))
+    dstart = -(-(16 + hlen)//64)*64
+    if mmap: mm = np.memmap(f, dtype=np.uint8, mode='r')
+    data = []
+    for cdef in header['columns']:
+      dt = np.dtype(str(cdef['dtype']))
+      shape = tuple(cdef['shape'])
+      n = int(np.prod(shape))
+      if mmap: # view on memory-mapped file
+        o = dstart + cdef['offset']
+        data.append(mm[o:o + n*dt.itemsize].view(dt).reshape(shape))
+      else: 
+        f.seek(dstart + cdef['offset'])
+        data.append(np.fromfile(f, dtype=dt, count=n).reshape(shape))
+  meta = dict(header['meta'])
+  meta['names'] = [cdef['name'] for cdef in header['columns']]
+  meta['units'] = [cdef['unit'] for cdef in header['columns']]
+  return header['hlines'], data, meta
+
+## ------- persistent cache for parsed input files -----------------
+
+# settings of the parse cache, changed by setParseCache()
+_parseCache = {'dir': None, 'maxsize': 1.e9, 'default': '~/.PhyPraKit_cache'}
+_cacheVersion = 2  # increase if results of readers change
+
+def setParseCache(cdir='~/.PhyPraKit_cache', maxsize=1.e9):
+  '''
+  enable (or disable) the persistent cache for parsed input files
+
+  the results of the readers ``readColumnData()``, ``readCSV()``, 
+  ``readtxt()``, ``readPicoScope()``, ``readCassy()`` and 
+  ``labxParser()`` are stored in numpy binary format and are
+  loaded via memory mapping when the same file is read again with 
+  the same arguments (copy-on-write: the arrays may be modified, 
+  the cache remains unchanged); entries are identified by path, size and 
+  modification time of the input file, the least recently used 
+  entries are removed if the cache exceeds its maximum size 
+
+  Args:
+    * cdir: string, cache directory, None to disable the cache
+    * maxsize: float, maximum size of cache in bytes
+  '''
+  if cdir is None: 
+    _parseCache['dir'] = None
+  else:
+    import os
+    _parseCache['dir'] = os.path.abspath(os.path.expanduser(cdir))
+  _parseCache['maxsize'] = maxsize
+
+def clearParseCache(file=None):
+  '''
+  invalidate entries of the parse cache
+  
+  Args:
+    * file: string, name of input file, None to clear complete cache
+  Returns:
+    * int: number of entries removed 
+  '''
+  import os
+  n=0
+  for entry in _cacheEntries():
+    if file is None or entry['file'] == os.path.abspath(file):
+      _cacheRemove(entry['path'])
+      n+=1
+  return n
+
+def parseCacheInfo(pr=True):
+  '''
+  list entries of the parse cache
+
+  Args:
+    * pr: bool, print list of entries if True
+  Returns:
+    * list of dictionaries with keys 'file', 'reader', 'args', 
+      'size' (in bytes) and 'used' (time of last access)
+  '''
+  import time
+  entries = sorted(_cacheEntries(), key=lambda e: e['used'])
+  if pr:
+    print("*==* parse cache %s: %i entries, %.1f MB"%(_cacheDir(),
+      len(entries), sum([e['size'] for e in entries])/1.e6))
+    for e in entries:
+      print("   %s  %8.1f kB  %s(%s) %s"%(
+        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['used'])),
+        e['size']/1.e3, e['reader'], e['args'], e['file']))
+  return entries
+
+def _useCache(cache, file):
+  '''
+  decide whether the parse cache is used 
+
+  Args:
+    * cache: None (use setting of ``setParseCache()``), True or False
+    * file: input file, only file names are cached
+  Returns:
+    * bool
+  '''
+  if cache is None: cache = _parseCache['dir'] is not None
+  return bool(cache) and type(file)==type(' ')
+
+def _cacheDir():
+  '''
+  directory of parse cache (default directory if cache is not enabled)
+  '''
+  import os
+  if _parseCache['dir'] is not None: return _parseCache['dir']
+  return os.path.abspath(os.path.expanduser(_parseCache['default']))
+
+def _cachedRead(reader, file, **kwargs):
+  '''
+  call reader, or load its result from the parse cache
+
+  Args:
+    * reader: function, one of the PhyPraKit readers
+    * file: string, file name
+    * kwargs: arguments of reader
+  Returns:
+    * result of reader, np-arrays are memory-mapped from cache 
+      (copy-on-write)
+  '''
+  import os, json, hashlib, shutil, tempfile
+  fname = os.path.abspath(file)
+  st = os.stat(fname)
+  # printout and number of processes do not change the result
+  args = dict([(k, v) for k, v in kwargs.items() 
+               if k not in ('pr', 'prlevel', 'nproc')])
+  sig = repr((_cacheVersion, fname, st.st_size, repr(st.st_mtime), 
+              reader.__name__, sorted(args.items())))
+  cdir = _cacheDir()
+  path = os.path.join(cdir, hashlib.sha1(sig.encode()).hexdigest())
+
+  if os.path.isfile(os.path.join(path, 'meta.json')):
+    try:
+      with open(os.path.join(path, 'meta.json'), 'r') as f:
+        meta = json.load(f)
+      # copy-on-write: arrays are writable, the cache is not modified
+      arrays = [np.load(os.path.join(path, 'a%i.npy'%i), mmap_mode='c')
+                for i in range(meta['narrays'])]
+      os.utime(os.path.join(path, 'meta.json'), None) # mark as used
+      return _cacheUnpack(meta['result'], arrays)
+    except Exception:    # damaged entry, read again
+      _cacheRemove(path)
+
+  result = reader(file, cache=False, **kwargs)
+
+  # store result in temporary directory, then move to final place
+  if not os.path.isdir(cdir): os.makedirs(cdir)
+  tmp = tempfile.mkdtemp(dir=cdir, prefix='.tmp')
+  arrays = []
+  meta = {'file': fname, 'size': st.st_size, 'mtime': st.st_mtime, 
+          'reader': reader.__name__, 'args': repr(sorted(args.items())),
+          'result': _cachePack(result, arrays), 'narrays': len(arrays)}
+  for i, a in enumerate(arrays):
+    np.save(os.path.join(tmp, 'a%i.npy'%i), a)
+  with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+    json.dump(meta, f)
+  try:
+    os.rename(tmp, path)
+  except OSError:  # stored concurrently by other process
+    shutil.rmtree(tmp, ignore_errors=True)
+  _cacheEvict(fname)
+  return result
+
+def _cachePack(obj, arrays):
+  '''
+  convert result of a reader to json-compatible structure
+
+  Args:
+    * obj: object to convert
+    * arrays: list, np-arrays found in obj are appended
+  Returns:
+    * json-compatible representation of obj
+  '''
+  if isinstance(obj, np.ndarray):
+    arrays.append(obj)
+    return {'npy': len(arrays)-1}
+  if isinstance(obj, (list, tuple)):
+    if len(obj) and all([isinstance(v, np.generic) for v in obj]): 
+      arrays.append(np.array(obj))   # list of numbers, store as array 
+      return {'npy': len(arrays)-1}
+    return {'list' if isinstance(obj, list) else 'tuple': 
+            [_cachePack(v, arrays) for v in obj]}
+  if isinstance(obj, dict):
+    return {'dict': [[k, _cachePack(v, arrays)] for k, v in obj.items()]}
+  if isinstance(obj, np.generic): obj = obj.item()
+  return {'val': obj}
+
+def _cacheUnpack(obj, arrays):
+  '''
+  inverse of ``_cachePack()``
+  '''
+  if 'npy' in obj: return arrays[obj['npy']]
+  if 'list' in obj: return [_cacheUnpack(v, arrays) for v in obj['list']]
+  if 'tuple' in obj: return tuple([_cacheUnpack(v, arrays) for v in obj['tuple']])
+  if 'dict' in obj: return dict([(k, _cacheUnpack(v, arrays)) for k, v in obj['dict']])
+  return obj['val']
+
+def _cacheEntries():
+  '''
+  list of entries in parse cache, as dictionaries with keys
+    'path', 'file', 'fsize', 'mtime', 'reader', 'args', 'size', 'used'
+  '''
+  import os, json
+  entries = []
+  cdir = _cacheDir()
+  if not os.path.isdir(cdir): return entries
+  for d in os.listdir(cdir):
+    path = os.path.join(cdir, d)
+    mfile = os.path.join(path, 'meta.json')
+    if d.startswith('.') or not os.path.isfile(mfile): continue
+    try:
+      with open(mfile, 'r') as f:
+        meta = json.load(f)
+    except Exception:
+      continue
+    entries.append({'path': path, 'file': meta['file'], 
+      'fsize': meta['size'], 'mtime': meta['mtime'],
+      'reader': meta['reader'], 'args': meta['args'],
+      'size': sum([os.path.getsize(os.path.join(path, f)) 
+                   for f in os.listdir(path)]),
+      'used': os.path.getmtime(mfile)})
+  return entries
+
+def _cacheRemove(path):
+  '''
+  remove an entry from the parse cache
+  '''
+  import shutil
+  shutil.rmtree(path, ignore_errors=True)
+
+def _cacheEvict(fname):
+  '''
+  remove outdated entries of input file fname and least recently 
+  used entries if size of cache exceeds maximum
+  '''
+  import os
+  entries = []
+  for e in _cacheEntries():
+    if e['file'] == fname and (e['fsize'] != os.path.getsize(fname) or 
+                               e['mtime'] != os.path.getmtime(fname)):
+      _cacheRemove(e['path']) # input file has changed
+    else:
+      entries.append(e)
+  entries.sort(key=lambda e: e['used'])
+  size = sum([e['size'] for e in entries])
+  while size > _parseCache['maxsize'] and len(entries) > 1:
+    e = entries.pop(0)
+    _cacheRemove(e['path'])
+    size -= e['size']
+
+## ------- archive of measurements (runs) -------------------------
+
+class RunArchive(object):
+  '''
+  append-only archive for many measurements (runs) in one directory: 
+  files are read once with the input functions of PhyPraKit, the 
+  data are stored in binary format (see ``writeBinary()``) and 
+  meta-data, channel names, units, numbers of values and ranges are 
+  indexed in an SQLite data base; queries return memory-mapped 
+  arrays, without parsing the original files again
+
+  Channel tags have the form 'number:quantity:symbol:unit', with 
+  channel numbers starting at 1, as returned by ``labxParser()``.
+
+  Example::
+
+    with RunArchive('myArchive') as ar:
+      ar.add('Drehpendel.labx')   # format detected with readAny()
+      for run, tag, values in ar.select(quantity='Winkel', minsamples=1e5):
+        ...
+  '''
+
+  def __init__(self, path):
+    '''
+    Args:
+      * path: string, directory of archive (created if not existing)
+    '''
+    import os, sqlite3
+    self.path = path
+    if not os.path.isdir(os.path.join(path, 'runs')):
+      os.makedirs(os.path.join(path, 'runs'))
+    self.db = sqlite3.connect(os.path.join(path, 'index.sqlite'))
+    with self.db:
+      self.db.execute('''CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY, file TEXT, format TEXT, size INTEGER, 
+        mtime REAL, added REAL, nchannels INTEGER, nsamples INTEGER,
+        tmin REAL, tmax REAL, meta TEXT)''')
+      self.db.execute('''CREATE TABLE IF NOT EXISTS channels (
+        run INTEGER, idx INTEGER, tag TEXT, quantity TEXT, unit TEXT, 
+        n INTEGER, vmin REAL, vmax REAL)''')
+      self.db.execute('''CREATE INDEX IF NOT EXISTS chq 
+                         ON channels (quantity, n)''')
+
+  def add(self, file, reader=None, meta=None, **kwargs):
+    '''
+    read a file and add it to the archive; files already contained
+    (same name, size and modification time) are not added again 
+
+    Args:
+      * file: string, file name
+      * reader: input function (default: chosen by ``readAny()``)
+      * meta: dictionary with additional meta-data (json-serializable)
+      * kwargs: further arguments for the input function
+    Returns:
+      * int: number of run in archive
+    '''
+    import os, time, json
+    fname = os.path.abspath(file)
+    st = os.stat(fname)
+    row = self.db.execute('SELECT id FROM runs WHERE file=? AND size=? '
+                          'AND mtime=?', (fname, st.st_size, st.st_mtime)).fetchone()
+    if row: return row[0]
+
+    if reader is None:
+      fmt, hinfo, data = readAny(file, **kwargs)
+    else:
+      fmt = reader.__name__
+      hinfo, data = reader(file, **kwargs)
+      if fmt == 'readColumnData': hinfo, data = data, hinfo
+    quantities, symbols, units, data, rmeta = _runChannels(file, fmt, 
+                                                           hinfo, data)
+    if meta: rmeta.update(meta)
+
+    nmax = max([len(d) for d in data]) if len(data) else 0
+    tmin = tmax = None
+    for q, u, d in zip(quantities, units, data):
+      if _isTime(q, u) and len(d):
+        tmin, tmax = float(np.nanmin(d)), float(np.nanmax(d))
+        break
+    with self.db:  # transaction, rolled back if storing data fails
+      run = self.db.execute('INSERT INTO runs (file, format, size, mtime, '
+        'added, nchannels, nsamples, tmin, tmax, meta) '
+        'VALUES (?,?,?,?,?,?,?,?,?,?)', (fname, fmt, st.st_size, st.st_mtime,
+        time.time(), len(data), nmax, tmin, tmax, json.dumps(rmeta))).lastrowid
+      for i, (q, sym, u, d) in enumerate(zip(quantities, symbols, units, 
+                                             data)):
+        vmin = float(np.nanmin(d)) if len(d) else None
+        vmax = float(np.nanmax(d)) if len(d) else None
+        self.db.execute('INSERT INTO channels VALUES (?,?,?,?,?,?,?,?)',
+          (run, i, '%i:%s:%s:%s'%(i+1, q, sym, u), q, u, len(d), vmin, vmax))
+      if writeBinary(self._blob(run), data, names=quantities, units=units,
+                     meta=rmeta):
+        raise IOError('RunArchive: storing data of %s failed'%file)
+    return run
+
+  def find(self, quantity=None, unit=None, minsamples=None, maxsamples=None,
+           fmt=None, file=None, meta=None):
+    '''
+    find runs with a channel matching all given conditions
+
+    Args:
+      * quantity: name of quantity (or list of names)
+      * unit: unit of quantity
+      * minsamples, maxsamples: range of number of values
+      * fmt: format of file, see ``readAny()``, or name of input function
+      * file: pattern for file name, wildcards * and ? allowed
+      * meta: dictionary, required values of meta-data
+    Returns:
+      * list of run numbers
+    '''
+    return sorted(set([r for r, i in self._query(quantity, unit, minsamples,
+                                           maxsamples, fmt, file, meta)]))
+
+  def select(self, quantity=None, unit=None, minsamples=None, maxsamples=None,
+             fmt=None, file=None, meta=None):
+    '''
+    select channels matching all given conditions, arguments as 
+    for ``find()``
+
+    Returns:
+      * list of tuples (run number, channel tag, memory-mapped np-array)
+    '''
+    result = []
+    loaded = {}
+    for run, i in self._query(quantity, unit, minsamples, maxsamples, 
+                              fmt, file, meta):
+      if run not in loaded: loaded[run] = self.load(run)
+      tags, data, rmeta = loaded[run]
+      result.append((run, tags[i], data[i]))
+    return result
+
+  def load(self, run):
+    '''
+    data of a run
+
+    Args:
+      * run: int, run number
+    Returns:
+      * tags: list of channel tags 'number:quantity:symbol:unit'
+      * data: list of memory-mapped np-arrays
+      * meta: dictionary with meta-data
+    '''
+    hlines, data, meta = readBinary(self._blob(run))
+    tags = [r[0] for r in self.db.execute(
+            'SELECT tag FROM channels WHERE run=? ORDER BY idx', (run,))]
+    for k in ('names', 'units'): meta.pop(k)
+    return tags, data, meta
+
+  def runs(self):
+    '''
+    list of all runs 
+
+    Returns:
+      * list of tuples (run number, file name, format, number of 
+        channels, maximum number of values, time range)
+    '''
+    return self.db.execute('SELECT id, file, format, nchannels, nsamples, '
+                           'tmin, tmax FROM runs ORDER BY id').fetchall()
+
+  def close(self):
+    '''
+    close the data base of the archive; arrays returned by ``load()``
+    and ``select()`` remain valid
+    '''
+    self.db.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def __len__(self):
+    return self.db.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+
+  def _blob(self, run):
+    import os
+    return os.path.join(self.path, 'runs', 'run%06i.ppk'%run)
+
+  def _query(self, quantity, unit, minsamples, maxsamples, fmt, file, meta):
+    import json
+    cond = []
+    args = []
+    if quantity is not None:
+      if type(quantity) not in (list, tuple): quantity = [quantity]
+      cond.append('c.quantity IN (%s)'%','.join(['?']*len(quantity)))
+      args += list(quantity)
+    for expr, val in (('c.unit=?', unit), ('c.n>=?', minsamples), 
+                      ('c.n<=?', maxsamples), ('r.format=?', fmt),
+                      ('r.file GLOB ?', file)):
+      if val is not None:
+        cond.append(expr)
+        args.append(val)
+    if file is not None and not any([c in file for c in '/\\']):
+      args[-1] = '*' + file   # match also without directory
+    rows = self.db.execute('SELECT c.run, c.idx, r.meta FROM channels c '
+      'JOIN runs r ON c.run=r.id' + (' WHERE ' if cond else '') + 
+      ' AND '.join(cond) + ' ORDER BY c.run, c.idx', args).fetchall()
+    if meta:
+      rows = [r for r in rows if all([json.loads(r[2]).get(k) == v 
+                                      for k, v in meta.items()])]
+    return [(r[0], r[1]) for r in rows]
+
+def _runChannels(file, fmt, hinfo, data):
+  '''
+  names of quantities, units, data and meta-data from the result 
+  of an input function, for RunArchive
+
+  Args:
+    * file: string, file name
+    * fmt: format, see ``readAny()``, or name of input function
+    * hinfo, data: result of input function
+  Returns:
+    * list of quantities, list of symbols, list of units, list of arrays, 
+      dict with meta-data
+  '''
+  data = [np.asarray(d, dtype=np.float32) if type(d)==type([]) else 
+          np.asarray(d) for d in data]
+  n = len(data)
+  quantities = ['']*n
+  symbols = ['']*n
+  units = ['']*n
+  meta = {}
+  if fmt in ('labx', 'labxParser'):   # tags 'index:quantity:symbol:unit'
+    quantities = [t.split(':')[1] for t in hinfo]
+    symbols = [t.split(':')[2] for t in hinfo]
+    units = [t.split(':')[-1] for t in hinfo]
+  elif fmt in ('cassy', 'readCassy'): # tags '"Zeit" t / s'
+    quantities = [_cassyNames(t)[0] for t in hinfo]
+    symbols = [_cassyNames(t)[1] for t in hinfo]
+    units = [t.split('/')[-1].strip() if '/' in t else '' for t in hinfo]
+  elif fmt in ('picoscope', 'readPicoScope'):
+    with _openInput(file) as f:
+      names = f.readline().strip().split(',' if _picoCSV(file) else '\t')
+    if len(names) == n: quantities = names
+    units = [u.strip('()') for u in hinfo]
+  elif fmt in ('columns', 'readColumnData'):
+    meta = dict([(k.lstrip('*'), v) for k, v in hinfo.items()])
+  elif len(hinfo):  # csv, txt: names in first header line
+    for delim in ('\t', ';', ','):
+      names = [w.strip().strip('"') for w in hinfo[0].strip().split(delim)]
+      if len(names) == n: 
+        quantities = names
+        break
+    meta['header'] = [l.strip() for l in hinfo]
+  if len(units) != n: units = ['']*n
+  return quantities, symbols, units, data, meta
+
+def _isTime(quantity, unit):
+  '''
+  channel with time values ?
+  '''
+  return quantity.lower() in ('zeit', 'time', 't') or \
+         quantity.lower().startswith('time ') or unit in ('s', 'ms', 'us')
+
+
 ## ------- section 2: statistics  -----------------------
 
 def wmean(x, sx, pr=True):
@@ -536,100 +2484,251 @@ def offsetFilter(a):
   '''
   return a-a.mean()
 
-def meanFilter(a, width=5):
+def meanFilter(a, width=5, edge='zero', axis=-1):
   ''' 
   apply a sliding average to smoothen data, 
 
   method:
     value at index i and int(width/2) neighbours are averaged
-    to from the new value at index i
+    to from the new value at index i; sums over the sliding window 
+    are obtained from cumulative sums, i.e. the execution time
+    is proportional to the number of values, independent of width
 
     Args:
-      * a: np-array of values
+      * a: np-array of values, 1d or nd
       * width: int, number of points to average over
         (if width is an even number, width+1 is used)
+      * edge: treatment of the int(width/2) values at each border:
+
+        - 'zero': set to zero (default, as in previous versions)
+        - 'valid': omitted, result is shorter by width-1 values
+        - 'shrink': average over the available values only
+        - 'reflect', 'symmetric', 'edge', 'wrap': average over values 
+          continued beyond the borders, as in ``np.pad()``
+
+      * axis: axis along which to average, for nd-arrays 
+        (e.g. channels x samples)
  
     Returns:
       * av  smoothed signal curve
   '''
 # -----------------------------------------------
-  l=len(a)
-  av = np.zeros(l) 
-  k=int(width/2)
-  for i in range(k, l-k+1):
-    av[i]= sum(a[i-k:i+k+1])/(2*k+1)
-
-  return av
-
-def resample(a, t=None, n=11):
+  a = np.moveaxis(np.asarray(a, dtype=np.float64), axis, -1)
+  l = a.shape[-1]
+  k = int(width/2)
+  w = 2*k+1
+  if edge in ('reflect', 'symmetric', 'edge', 'wrap'):
+    b = np.pad(a, [(0, 0)]*(a.ndim-1) + [(k, k)], mode=edge)
+  elif edge in ('zero', 'valid', 'shrink'):
+    b = a
+  else:
+    raise ValueError("meanFilter: unknown edge treatment '%s'"%(edge))
+
+  # cumulative sums, offset subtracted to limit rounding errors
+  off = b.mean(axis=-1, keepdims=True) if b.shape[-1] else np.zeros(1)
+  c = np.zeros(b.shape[:-1] + (b.shape[-1]+1,))
+  np.cumsum(b - off, axis=-1, out=c[..., 1:])
+  # sums over complete windows 
+  av = (c[..., w:] - c[..., :-w])/w + off
+
+  if edge == 'zero':
+    av0 = np.zeros(a.shape)
+    av0[..., k:l-k] = av
+    if k and l >= 2*k: # last window, truncated at the border
+      av0[..., l-k] = (c[..., l] - c[..., l-2*k] + 2*k*off[..., 0])/w
+    av = av0
+  elif edge == 'shrink':
+    i = np.arange(l)
+    lo = np.maximum(i-k, 0)
+    hi = np.minimum(i+k+1, l)
+    av = (c[..., hi] - c[..., lo])/(hi-lo) + off
+
+  return np.moveaxis(av, -1, axis)
+
+def resample(a, t=None, n=11, method='average', partial='drop', axis=-1):
   ''' 
   perform average over n data points of array a, 
   return reduced array, eventually with corresponding time values 
 
   method:
     value at index `i` and `int(width/2)` neighbours are averaged
-    to from the new value at index `i`
+    to from the new value at index `i`; the array is reshaped to
+    blocks of n values, which are averaged in one step.
+    With method 'polyphase', an anti-aliasing low-pass filter is 
+    applied before decimation (``scipy.signal.resample_poly()``)
 
     Args:
-      * a, t: np-arrays of values of same length
-      * width: int, number of values of array `a` to average over
-        (if width is an even number, width+1 is used)
+      * a, t: np-arrays of values of same length; `a` may also be
+        a list of channels or a 2d array (channels x samples)
+      * n: int, number of values of array `a` to average over
+        (if n is an even number, n+1 is used)
+      * method: 'average' (default) or 'polyphase' (anti-aliased)
+      * partial: treatment of an incomplete block of values at the end:
+        'drop' (default) or 'keep' (average over remaining values)
+      * axis: axis of samples, for nd-arrays
  
     Returns:
       * av: array with reduced number of samples
       * tav:  a second, related array with reduced number of samples 
   '''
+  a = np.moveaxis(np.asarray(a), axis, -1)
+  l = a.shape[-1]
   k = int(n/2)
-  nav = int( len(a) /(2*k+1))
-  av = np.zeros(nav) 
-  if t is not None: 
-    tav=np.zeros(nav)
-  j=0
-  for i in range(k, len(a)-k, 2*k+1):
-    av[j]= sum(a[i-k:i+k+1])/(2*k+1)
-    if t is not None: tav[j]=t[i]
-    j+=1
-  
+  w = 2*k+1
+  nav = int(l/w)
+  if partial not in ('drop', 'keep'):
+    raise ValueError("resample: unknown treatment of partial block '%s'"\
+      %(partial))
+  nout = nav if partial == 'drop' else -(-l//w)  # incl. partial block
+
+  if method == 'average':
+    # blocks of w values as last index, averaged in one step
+    av = np.empty(a.shape[:-1] + (nout,))
+    av[..., :nav] = a[..., :nav*w].reshape(a.shape[:-1] + (nav, w))\
+                                  .sum(axis=-1, dtype=np.float64)/w
+    if nout > nav:
+      av[..., nav] = a[..., nav*w:].mean(axis=-1, dtype=np.float64)
+    if t is not None: # time values at centres of blocks
+      t = np.asarray(t)
+      tav = np.empty(nout)
+      tav[:nav] = t[k:nav*w:w]
+      if nout > nav: tav[nav] = t[nav*w:].mean()
+  elif method == 'polyphase':
+    from scipy.signal import resample_poly
+    av = resample_poly(a, 1, w, axis=-1)[..., :nout]
+    if t is not None: # time values of retained samples
+      tav = np.array(np.asarray(t)[::w][:nout], dtype=np.float64)
+  else:
+    raise ValueError("resample: unknown method '%s'"%(method))
+
+  av = np.moveaxis(av, -1, axis)
   if t is not None:
     return av, tav
   else: 
     return av
 
-def Fourier_fft(t, a):
+_windowCache = {} # window functions, key (name, number of samples)
+
+def _window(window, n):
+  '''
+  window function for n samples, from cache if possible
+
+  Args:
+    * window: name of window (see ``scipy.signal.get_window()``), 
+      or array of weights
+    * n: number of samples
+  Returns:
+    * array with weights 
+  '''
+  if not isinstance(window, str):
+    w = np.asarray(window, dtype=np.float64)
+    if w.shape != (n,):
+      raise ValueError("window: expected %i weights, got %s"%(n, w.shape))
+    return w
+  key = (window, n)
+  if key not in _windowCache:
+    from scipy.signal import get_window
+    if len(_windowCache) > 32: _windowCache.clear()
+    w = get_window(window, n)
+    w.flags.writeable = False
+    _windowCache[key] = w
+  return _windowCache[key]
+
+def _nextFastLen(n, real=True):
+  '''
+  smallest product of powers of 2, 3 and 5 not smaller than n, 
+  as ``scipy.fft.next_fast_len()`` (for scipy < 1.4)
+  '''
+  best = 1
+  while best < n: best *= 2
+  p5 = 1
+  while p5 < best:
+    p35 = p5
+    while p35 < best:
+      p = p35
+      while p < n: p *= 2
+      best = min(best, p)
+      p35 *= 3
+    p5 *= 5
+  return best
+
+def Fourier_fft(t, a, window=None, pad=False, axis=-1):
   ''' 
   Fourier transform of the amplitude spectrum a(t) 
   
   method: 
-    uses `numpy.fft` and `numpy.fftfreq`; 
-    output amplitude is normalised to number of samples; 
+    uses `scipy.fft.rfft` (transform of real input) and `rfftfreq`,
+    or `numpy.fft` for scipy < 1.4; 
+    output amplitude is normalised to number of samples, or to the 
+    sum of weights if a window function is applied; 
+    all channels of a 2d-array are transformed at once
 
     Args:
       * t: np-array of time values
-      * a: np-array amplidude a(t)
+      * a: np-array amplidude a(t), or 2d-array (channels x samples)
+      * window: name of window function (e.g. 'hann', 'blackman', 
+        'flattop', see ``scipy.signal.get_window()``) or array of weights;
+        windows are cached for repeated calls with the same length
+      * pad: if True, pad with zeros to a fast transform length
+      * axis: axis of samples, for nd-arrays
  
     Returns:
       * arrays f, a_f: frequencies and amplitudes
   '''
 # -----------------------------------------------
-  from numpy.fft import fft, fftfreq
+  try:
+    from scipy.fft import rfft, rfftfreq, next_fast_len
+  except ImportError:  # scipy < 1.4
+    from numpy.fft import rfft, rfftfreq
+    next_fast_len = _nextFastLen
 
+  a = np.moveaxis(np.asarray(a), axis, -1)
   n = len(t)
   dt = (t[-1]-t[0])/(n-1.)       # time step
-  freq = fftfreq(n, dt)[:n/2]    # only positive frequencies
-  amp = abs(fft(a))[:n/2]*2./n
+  nfft = next_fast_len(n, real=True) if pad else n
+  if window is None:
+    norm = 2./n
+  else:
+    w = _window(window, n)
+    a = a * w
+    norm = 2./w.sum()
+  freq = rfftfreq(nfft, dt)[:nfft//2]    # only positive frequencies
+  amp = np.abs(rfft(a, n=nfft, axis=-1)[..., :nfft//2])*norm
 
-  return freq, amp
+  return freq, np.moveaxis(amp, -1, axis)
 
 
-def FourierSpectrum(t, a, fmax=None):
+def FourierSpectrum(t, a, fmax=None, freq=None, method='exact', maxmem=5.e7):
   '''
   Fourier transform of amplitude spectrum a(t), for equidistant sampling times
    (a simple implementaion for didactical purpose only, 
-   consider using ``Fourier_fft()`` )
+   consider using ``Fourier_fft()``, or ``LombScargle()`` for 
+   non-equidistant sampling times)
+
+  method:
+    the Fourier coefficients are evaluated for blocks of frequencies
+    at once, the size of the blocks is limited by the memory budget; 
+
+      - 'exact': sums over samples are evaluated in sequential order, 
+        results are identical to an explicit loop 
+      - 'fast': for sampling times t0 + k*dt, the phase factors 
+        exp(i omega k dt) are obtained as products of the factors for
+        blocks of samples and within blocks; much less sin and cos
+        values are needed, and the sums are evaluated as matrix products
+        (agreement with method 'exact' within rounding errors); 
+        requires equidistant sampling times: if a time value deviates
+        from t0 + k*dt by more than 1% of dt (plus the resolution of 
+        the stored time values), method 'exact' is used
 
     Args:
       * t: np-array of time values
       * a: np-array amplidude a(t)
+      * fmax: maximum frequency (default: Nyquist frequency)
+      * freq: np-array of frequencies to evaluate, e.g. a fine grid 
+        around a resonance or log-spaced; default: multiples of 
+        1/(t[-1]-t[0]) up to fmax
+      * method: 'exact' (default) or 'fast'
+      * maxmem: memory budget (in bytes) for intermediate arrays
  
     Returns:
       * arrays freq, amp: frequencies and amplitudes
@@ -637,35 +2736,238 @@ def FourierSpectrum(t, a, fmax=None):
 # -----------------------------------------------
 
   n = len(t)      
-  T = t[-1 ]-t[0] # total time covered by sample
-  df = 1./T       # smallest frequency and frequency step
-  dt = T / (n-1.) # time step, 1/2 1/dt is largest frequency
-  fmx = 0.5/dt    # Nyquist Theorem: n/2 frequency components
-  if fmax is not None:
-    if fmax>fmx:
-       print("!!! FourierSpectrum: fmax too large, set to ", fmx)
-    fmx = min(fmax, fmx)
-
-  freq = np.arange(df, fmx, df)
-
-  # calulate coefficients
+  if freq is None:
+    T = t[-1 ]-t[0] # total time covered by sample
+    df = 1./T       # smallest frequency and frequency step
+    dt = T / (n-1.) # time step, 1/2 1/dt is largest frequency
+    fmx = 0.5/dt    # Nyquist Theorem: n/2 frequency components
+    if fmax is not None:
+      if fmax>fmx:
+         print("!!! FourierSpectrum: fmax too large, set to ", fmx)
+      fmx = min(fmax, fmx)
+    freq = np.arange(df, fmx, df)
+  else:
+    freq = np.asarray(freq, dtype=np.float64).ravel()
+
+  if method == 'fast':
+    dt = (t[-1]-t[0])/(n-1.)
+    tk = t[0] + np.arange(n)*dt
+    # tolerance: 1% of time step, and resolution of stored time values
+    tol = 0.01*dt
+    if np.asarray(t).dtype.kind == 'f': 
+      tol += np.finfo(np.asarray(t).dtype).eps*max(abs(t[0]), abs(t[-1]))
+    if n > 2 and np.abs(np.asarray(t, dtype=np.float64) - tk).max() > tol:
+      print("!!! FourierSpectrum: sampling times not equidistant, " +
+            "using method 'exact'")
+      method = 'exact'
+
+  # calulate coefficients for blocks of frequencies
+  #   (the full matrix omega x t would use much memory !!)
   amp = np.zeros(len(freq))
-  i=0
-  for f in freq:
-    omega = 2. * np.pi * f
-    s=sum(a * np.sin(omega * t))*2./n
-    c=sum(a * np.cos(omega * t))*2./n
-    amp[i] = np.sqrt(s**2 + c**2)
-    i+=1
-  # alternative implementation without explicitely writing the loop
-  #omegat=np.outer(2.*np.pi*freq, t)  # this uses much memory !!
-  #s = np.matmul(np.sin(omegat), a)*2./n
-  #c = np.matmul(np.cos(omegat), a)*2./n
-  #amp = np.sqrt(s**2 + c**2)
+  if method == 'exact':
+    nblk = max(1, min(len(freq), int(maxmem/(16.*max(n, 1)))))
+    sbuf = np.empty((nblk, n))
+    cbuf = np.empty((nblk, n))
+    for i in range(0, len(freq), nblk):
+      omega = 2. * np.pi * freq[i:i+nblk]
+      m = len(omega)
+      omegat = np.multiply.outer(omega, t, out=sbuf[:m])
+      c = np.cos(omegat, out=cbuf[:m])
+      s = np.sin(omegat, out=sbuf[:m])
+      # sums in sequential order, last elements of cumulative sums 
+      s = np.cumsum(np.multiply(a, s, out=s), axis=1, out=s)[:, -1]*2./n
+      c = np.cumsum(np.multiply(a, c, out=c), axis=1, out=c)[:, -1]*2./n
+      amp[i:i+m] = np.sqrt(s**2 + c**2)
+
+  elif method == 'fast':
+    # sample index k = b*nr + r, values arranged as matrix (b, r)
+    nr = int(np.sqrt(n)) + 1 
+    nb = -(-n//nr)
+    ab = np.zeros(nb*nr)
+    ab[:n] = a
+    ab = ab.reshape(nb, nr).T
+    nblk = max(1, min(len(freq), int(maxmem/(16.*(nr + 2*nb)))))
+    for i in range(0, len(freq), nblk):
+      omega = 2. * np.pi * freq[i:i+nblk]
+      # phase factors within blocks and of blocks
+      zr = np.exp(1j*np.multiply.outer(omega, np.arange(nr)*dt))
+      zb = np.exp(1j*np.multiply.outer(omega, np.arange(nb)*(nr*dt)))
+      # |sum_k a_k exp(i omega k dt)|, phase exp(i omega t0) drops out
+      amp[i:i+len(omega)] = np.abs((np.dot(zr, ab)*zb).sum(axis=1))*2./n
+
+  else:
+    raise ValueError("FourierSpectrum: unknown method '%s'"%(method))
 
   return freq, np.array(amp)
 
 
+def _extirpolate(x, y, N, M=6):
+  '''
+  extirpolation (reverse interpolation) of values y at positions x
+  onto a regular grid, i.e. sum(y*f(x)) = sum(grid*f(range(N))) for 
+  polynomials f of degree < M (Press & Rybicki, 1989)
+
+  Args:
+    * x: np-array of positions in [0, N)
+    * y: np-array of values, or 2d-array (channels x values)
+    * N: number of grid points
+    * M: number of grid points used per value
+  Returns:
+    * grid: np-array of length N, or 2d-array (channels x N)
+  '''
+  y = np.atleast_2d(y)
+  nch = y.shape[0]
+  offs = (np.arange(nch)*N)[:, None]  # index offsets of channels
+  grid = np.zeros(nch*N)
+  # values at grid points 
+  ints = x % 1 == 0
+  ix = x[ints].astype(int)
+  grid += np.bincount((ix + offs).ravel(), weights=y[:, ints].ravel(),
+                      minlength=nch*N)
+  # all other values: Lagrange interpolation weights on M points
+  x, y = x[~ints], y[:, ~ints]
+  ilo = np.clip((x - M//2).astype(int), 0, N - M)
+  num = np.prod(x - ilo - np.arange(M)[:, None], axis=0)
+  den = float(np.prod(np.arange(1, M)))  # (M-1)!
+  for j in range(M):
+    if j > 0: den *= j/float(j - M)
+    ind = ilo + (M - 1 - j)
+    grid += np.bincount((ind + offs).ravel(), 
+                        weights=(y*(num/(den*(x - ind)))).ravel(),
+                        minlength=nch*N)
+  return grid.reshape(nch, N)
+
+def _trigSums(t, h, f0, df, N, ofac=16, M=8):
+  '''
+  sums S = sum(h*sin(2 pi f t)), C = sum(h*cos(2 pi f t)) for 
+  frequencies f = f0 + j*df, j = 0 ... N-1, via extirpolation of 
+  the values h onto a regular grid and FFT (Press & Rybicki, 1989)
+
+  Args:
+    * t: np-array of (irregular) time values
+    * h: np-array of values, or 2d-array (channels x values)
+    * f0: first frequency
+    * df: frequency step
+    * N: number of frequencies
+    * ofac: oversampling factor of the grid 
+    * M: number of grid points used per value
+  Returns:
+    * S, C: 2d-arrays (channels x frequencies)
+  '''
+  t0 = t.min()
+  h = np.atleast_2d(h)
+  if f0 != 0.:
+    h = h * np.exp(2j*np.pi*f0*(t - t0))
+  # time values in units of the period 1/df, mapped to the grid
+  nfft = 1 << int(np.ceil(np.log2(max(N*ofac, M))))
+  x = ((t - t0)*df % 1)*nfft
+  if np.iscomplexobj(h):
+    grid = _extirpolate(x, h.real, nfft, M) \
+           + 1j*_extirpolate(x, h.imag, nfft, M)
+  else:
+    grid = _extirpolate(x, h, nfft, M)
+  fgrid = np.fft.ifft(grid, axis=-1)[:, :N]*nfft
+  if t0 != 0.:
+    fgrid *= np.exp(2j*np.pi*t0*(f0 + df*np.arange(N)))
+  return fgrid.imag, fgrid.real
+
+def LombScargle(t, a, fmax=None, freq=None, method='fast', maxmem=5.e7,
+                axis=-1):
+  '''
+  amplitude spectrum of a(t) for non-equidistant sampling times
+  (Lomb-Scargle periodogram)
+
+  method:
+    for each frequency, a sine wave with a phase offset is fit to the 
+    data (after subtraction of the mean), and the amplitude is 
+    returned; for equidistant sampling, the result approximately 
+    agrees with ``FourierSpectrum()``. Where the sine (or cosine) 
+    term vanishes for all samples, e.g. at f = 0, only the other 
+    term is fit; the amplitude at f = 0 is 0. 
+
+      - 'fast': the sums over samples needed for all frequencies are 
+        obtained by extirpolation to a regular grid and FFT, 
+        execution time is O(n log n) (Press & Rybicki, 1989);
+        deviations from method 'exact' are below ~1e-4 of the maximum
+        (largest close to the highest frequency, typically 1e-5)
+      - 'exact': direct evaluation of the sums for blocks of 
+        frequencies, limited by the memory budget; used for 
+        non-equidistant grids of frequencies
+
+    Args:
+      * t: np-array of time values
+      * a: np-array amplidude a(t), or 2d-array (channels x samples)
+      * fmax: maximum frequency (default: 0.5 (n-1)/(t[-1]-t[0]),
+        i.e. the Nyquist frequency for the mean time step)
+      * freq: np-array of frequencies to evaluate; default: multiples 
+        of 1/(t[-1]-t[0]) up to fmax
+      * method: 'fast' (default) or 'exact'
+      * maxmem: memory budget (in bytes) for intermediate arrays
+        with method 'exact'
+      * axis: axis of samples, for nd-arrays
+ 
+    Returns:
+      * arrays freq, amp: frequencies and amplitudes
+  '''
+# -----------------------------------------------
+  t = np.asarray(t, dtype=np.float64)
+  a = np.moveaxis(np.asarray(a, dtype=np.float64), axis, -1)
+  shape = a.shape[:-1]
+  n = len(t)
+  y = a.reshape(-1, n)
+  y = (y - y.mean(axis=-1, keepdims=True))/n  # weights 1/n
+
+  if freq is None:
+    T = np.ptp(t)   # total time covered by sample
+    df = 1./T       # smallest frequency and frequency step
+    fmx = 0.5*(n-1.)/T if fmax is None else fmax
+    freq = np.arange(df, fmx, df)
+  else:
+    freq = np.asarray(freq, dtype=np.float64).ravel()
+  nf = len(freq)
+  df = (freq[-1] - freq[0])/(nf - 1.) if nf > 1 else 1.
+  if method == 'fast' and (nf == 0 or df <= 0. or \
+      not np.allclose(np.diff(freq), df, rtol=1.e-6, atol=0.)):
+    method = 'exact'  # no equidistant frequencies
+
+  # sums over samples of y sin(w t), y cos(w t), sin(2 w t), cos(2 w t)
+  if method == 'fast':
+    Sh, Ch = _trigSums(t, y, freq[0], df, nf)
+    S2, C2 = _trigSums(t, np.ones(n)/n, 2.*freq[0], 2.*df, nf)
+    S2, C2 = S2[0], C2[0]
+  elif method == 'exact':
+    Sh, Ch = np.zeros((len(y), nf)), np.zeros((len(y), nf))
+    S2, C2 = np.zeros(nf), np.zeros(nf)
+    nblk = max(1, min(nf, int(maxmem/(32.*max(n, 1)))))
+    for i in range(0, nf, nblk):
+      omegat = np.multiply.outer(2.*np.pi*freq[i:i+nblk], t)
+      sn, cs = np.sin(omegat), np.cos(omegat)
+      Sh[:, i:i+nblk] = np.dot(y, sn.T)
+      Ch[:, i:i+nblk] = np.dot(y, cs.T)
+      S2[i:i+nblk] = (2.*sn*cs).mean(axis=1)
+      C2[i:i+nblk] = ((cs - sn)*(cs + sn)).mean(axis=1)
+  else:
+    raise ValueError("LombScargle: unknown method '%s'"%(method))
+
+  # phase offset tau with sum(sin(2 w (t - tau))) = 0
+  hyp = np.hypot(S2, C2)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    C2w, S2w = np.where(hyp > 0., C2/hyp, 1.), np.where(hyp > 0., S2/hyp, 0.)
+    Cw = np.sqrt(0.5*(1. + C2w))
+    Sw = np.sign(S2w)*np.sqrt(0.5*(1. - C2w))
+    YC = Ch*Cw + Sh*Sw
+    YS = Sh*Cw - Ch*Sw
+    CC = 0.5*(1. + C2*C2w + S2*S2w)
+    SS = 0.5*(1. - C2*C2w - S2*S2w)
+    # amplitude of sine wave fit to data; terms vanishing for all 
+    #   samples (CC + SS = 1), e.g. sine at f = 0, are not fit
+    eps = 1.e-10
+    amp = np.sqrt(np.where(CC > eps, YC/CC, 0.)**2 + 
+                  np.where(SS > eps, YS/SS, 0.)**2)
+
+  return freq, np.moveaxis(amp.reshape(shape + (nf,)), -1, axis)
+
+
 def simplePeakfinder(x, a, th=0.):
   ''' 
   find positions of all maxima (peaks) in data
@@ -45,7 +45,8 @@ if __name__ == "__main__":
 
 #  filename="CassyExample.labx"
   filename="Drehpendel.labx"
-  names, values = labxParser(filename, prlevel=0)
+  names, values = labxParser(filename, prlevel=0,
+                             channels=['Zeit', 'Weg', 'Winkel'])
 
 # collect data we are interested in:
   print("\n *==* Data received:")
@@ -29,21 +29,18 @@ if __name__ == "__main__":
     fname = sys.argv[1]
   else:
     fname="GammaSpektra.labx"
-  names, values = labxParser(fname, prlevel=0)
+  names, values = labxParser(fname, prlevel=0, runs=True,
+                             channels=['Kanal', 'Ereignisse'])
 
-# 
-  k = []
-  n = []
 # collect data we are interested in:
+#   spectra of all runs as 2d arrays (runs x channels)
   print("\n *==* Data received:")
   for i, tag in enumerate(names):
-    print((tag.split(':'), "length = ",len(values[i][:])))  
+    print((tag.split(':'), "shape = ", np.shape(values[i])))  
     tnam=tag.split(':')[1]
-    if tnam=='Kanal':   k.append( np.array(values[i][:]))
-    if tnam=='Ereignisse':   n.append(np.array(values[i][:]))
-# not claer what these are ...
-#    if tnam=='Zeit':   t = np.array(values[i][:])
-#    if tnam=='Spannung':  U = np.array(values[i][:])
+    if tnam=='Kanal':   k = values[i]
+    if tnam=='Ereignisse':   n = values[i]
+  print("     total number of events: ", n.sum(axis=1))
 
       
 # define a Figure      
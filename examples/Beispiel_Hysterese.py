@@ -52,8 +52,7 @@ if __name__ == "__main__":
   if l > 400:
     nr = int(l/150)
     print(('** resampling by factor ', nr))
-    vI, t = resample(vI, t, n=nr)  
-    vB = resample(vB, n=nr)  
+    (vI, vB), t = resample((vI, vB), t, n=nr)  
  
 
   print('** spline interpolation') 
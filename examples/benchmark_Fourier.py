@@ -0,0 +1,110 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_Fourier.py
+   spectra of many waveforms of equal length: execution time of
+   Fourier_fft() for all channels of a 2d-array at once, compared
+   to one complex fft per channel, as in previous versions;
+   the amplitudes of the results are compared, and the amplitude
+   of a sine wave is shown for different window functions;
+   execution time of FourierSpectrum() with methods 'exact' and 'fast', 
+   compared to a loop over frequencies, as in previous versions
+
+   uses PhyPraKit.Fourier_fft(), PhyPraKit.FourierSpectrum()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, time, numpy as np
+  import PhyPraKit as ppk
+
+  # check for / read command line arguments
+  nwf = int(sys.argv[1]) if len(sys.argv)==2 else 500
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  def complexfft(t, a):
+    # complex fft per channel, as in previous versions of Fourier_fft()
+    n = len(t)
+    dt = (t[-1]-t[0])/(n-1.)
+    freq = np.fft.fftfreq(n, dt)[:n//2]
+    amp = abs(np.fft.fft(a))[:n//2]*2./n
+    return freq, amp
+
+  def best(f, *args, **kwargs):
+    # execution time, best of three
+    dt = 1.e9
+    for i in range(3):
+      t0 = time.time()
+      f(*args, **kwargs)
+      dt = min(dt, time.time() - t0)
+    return dt
+
+  print("  %i waveforms of n samples"%nwf)
+  print("        n   per channel (s)   Fourier_fft (s)  spectra/s  agreement")
+  for n in (1000, 4096, 10007, 100000):
+    t = np.arange(n)*1.e-6
+    a = np.random.normal(size=(nwf, n))
+    tl = best(lambda: [complexfft(t, x) for x in a])
+    tb = best(ppk.Fourier_fft, t, a)
+    same = np.allclose(ppk.Fourier_fft(t, a)[1],
+                       [complexfft(t, x)[1] for x in a])
+    print("  %7i   %10.3f        %10.3f      %8.0f     %s"%(n, tl, tb,
+                                                         nwf/tb, same))
+  # prime length, padding to fast transform length
+  n = 10007
+  t = np.arange(n)*1.e-6
+  a = np.random.normal(size=(nwf, n))
+  print("  %7i   padded to fast transform length:  %.3f s"%(n,
+                                      best(ppk.Fourier_fft, t, a, pad=True)))
+
+  # amplitude of a sine wave between frequency bins
+  n = 1009
+  t = np.arange(n)*1.e-3
+  a = 3.*np.sin(2.*np.pi*123.4*t)
+  print("\n  sine wave, amplitude 3, f = 123.4 Hz")
+  print("  window     f_max (Hz)   amplitude")
+  for window in (None, 'hann', 'blackman', 'flattop'):
+    freq, amp = ppk.Fourier_fft(t, a, window=window, pad=True)
+    print("  %-9s  %8.2f      %6.3f"%(window, freq[np.argmax(amp)],
+                                       amp.max()))
+
+  # FourierSpectrum() for the data of Beispiel_Drehpendel.py
+  def loop(t, a, fmax):
+    # loop over frequencies, as in previous versions of FourierSpectrum()
+    n = len(t)
+    df = 1./(t[-1]-t[0])
+    freq = np.arange(df, min(fmax, 0.5*(n-1.)*df), df)
+    amp = np.zeros(len(freq))
+    for i, f in enumerate(freq):
+      omega = 2. * np.pi * f
+      s = sum(a * np.sin(omega * t))*2./n
+      c = sum(a * np.cos(omega * t))*2./n
+      amp[i] = np.sqrt(s**2 + c**2)
+    return freq, amp
+
+  names, values = ppk.labxParser('Drehpendel.labx', prlevel=0)
+  for tag, v in zip(names, values):
+    if tag.split(':')[1] == 'Zeit': t = np.array(v)
+    if tag.split(':')[1] == 'Winkel': phi = ppk.offsetFilter(np.array(v))
+  print("\n  FourierSpectrum(), Drehpendel.labx, fmax = 1 Hz")
+  print("  samples  method     time (s)   max. deviation")
+  for nr in (int(len(t)/1000), 1):
+    tr, phir = ppk.resample(t, n=nr), ppk.resample(phi, n=nr)
+    # CASSY sampling times vary, method 'fast' needs equidistant times
+    tr = np.linspace(tr[0], tr[-1], len(tr))
+    freq, ref = loop(tr, phir, 1.)
+    print("  %6i   loop      %8.4f"%(len(tr), best(loop, tr, phir, 1.)))
+    for method in ('exact', 'fast'):
+      freq, amp = ppk.FourierSpectrum(tr, phir, fmax=1., method=method)
+      print("  %6i   %-8s  %8.4f     %.1e"%(len(tr), method,
+        best(ppk.FourierSpectrum, tr, phir, fmax=1., method=method),
+        np.abs(amp - ref).max()/ref.max()))
+  # fine grid around resonance
+  freq = np.linspace(0.5, 0.8, 301)
+  ref = ppk.FourierSpectrum(tr, phir, freq=freq)[1]
+  amp = ppk.FourierSpectrum(tr, phir, freq=freq, method='fast')[1]
+  print("  %i equidistant samples, %i frequencies in [0.5, 0.8] Hz:"\
+        %(len(tr), len(freq)), "  max. deviation %.1e"%(
+                                        np.abs(amp - ref).max()/ref.max()))
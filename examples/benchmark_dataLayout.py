@@ -0,0 +1,57 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_dataLayout.py
+   execution time of a typical processing chain (offset correction,
+   sliding average, Fourier transformation) applied to all channels 
+   of a multi-channel file in PicoScope format, for different data 
+   layouts and data types returned by readPicoScope()
+
+   uses PhyPraKit.readPicoScope(), offsetFilter()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, time, tempfile, numpy as np
+  from PhyPraKit import readPicoScope, offsetFilter
+
+  # check for / read command line arguments
+  nrows = int(sys.argv[1]) if len(sys.argv)==2 else 500000
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # simulated PicoScope export: time and 4 channels
+  nch = 4
+  t = np.linspace(0., 10., nrows)
+  fname = os.path.join(tempfile.mkdtemp(), 'PicoScope4ch.txt')
+  with open(fname, 'w') as f:
+    f.write('Zeit\t' + '\t'.join(['Kanal %s'%c for c in 'ABCD'][:nch]) + '\n')
+    f.write('(ms)\t' + '\t'.join(['(V)']*nch) + '\n\n')
+    np.savetxt(f, np.array([t] + 
+      [np.sin(2.*np.pi*(i+1)*t) + 0.1*np.random.randn(nrows)
+       for i in range(nch)]).T, fmt='%.6g', delimiter='\t')
+  print('     %i channels with %i samples'%(nch, nrows))
+
+  def chain(t, a):
+    # offset correction, sliding average over 11 samples, spectrum 
+    a = offsetFilter(a)
+    a = np.convolve(a, np.ones(11)/11., mode='same')
+    return np.abs(np.fft.rfft(a))
+
+  print("  dtype     contiguous   read (s)   chain (s)")
+  for dtype in (np.float32, np.float64):
+    for contiguous in (False, True):
+      t0 = time.time()
+      units, data = readPicoScope(fname, dtype=dtype, contiguous=contiguous,
+                                  cache=False)
+      t1 = time.time()
+      dt = 1.e9  # best of 5
+      for i in range(5):
+        t2 = time.time()
+        spectra = [chain(data[0], data[i]) for i in range(1, nch+1)]
+        dt = min(dt, time.time() - t2)
+      print("  %-8s  %-10s  %8.3f    %8.4f"%(np.dtype(dtype).name, 
+                                           contiguous, t1-t0, dt))
+  os.remove(fname)
+  os.rmdir(os.path.dirname(fname))
@@ -0,0 +1,61 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_labxParser.py
+   compare execution time and peak memory of the parsing
+   engines of labxParser() for files in CASSY .labx format, 
+   including parallel conversion of values in all cpus;
+   the results of all engines are checked value by value
+   against the default engine 'tree'
+
+   uses PhyPraKit.labxParser()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, time, tracemalloc, multiprocessing, numpy as np
+  from PhyPraKit import labxParser
+
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    fnames = [sys.argv[1]]
+  else:
+    fnames = ["CassyExample.labx", "Drehpendel.labx", "GammaSpektra.labx"]
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  ncpu = multiprocessing.cpu_count()
+  engines = ['tree', 'stream', 'fast', 'parallel']
+  print("     'parallel': engine 'fast' in %i processes"%ncpu)
+  for fname in fnames:
+    print('\n     processing file ' + fname,\
+      ' (%.1f MB)'%(os.path.getsize(fname)/1.e6))
+    print("  engine     time (s)   peak memory (MB)   speed-up  identical")
+    for engine in engines:
+      # execution time, best of three
+      dt = 1.e9
+      for i in range(3):
+        t0 = time.time()
+        names, values = labxParser(fname, prlevel=0, 
+                          engine='fast' if engine=='parallel' else engine, 
+                          nproc=ncpu if engine=='parallel' else 1)
+        dt = min(dt, time.time() - t0)
+      # peak memory (measured in separate run, tracing slows down execution)
+      #   (for engine 'parallel' only memory of main process)
+      del names, values
+      tracemalloc.start()
+      names, values = labxParser(fname, prlevel=0,
+                        engine='fast' if engine=='parallel' else engine, 
+                        nproc=ncpu if engine=='parallel' else 1)
+      current, peak = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+      if engine == 'tree':
+        tref, rnames, rvalues = dt, names, values
+      # compare value by value with reference
+      same = names == rnames and len(values) == len(rvalues)
+      for v, rv in zip(values, rvalues):
+        same = same and np.array_equal(np.asarray(v),
+                 np.asarray(rv, dtype=np.float32), equal_nan=True)
+      print("  %-8s  %8.3f   %10.1f       %8.1f   %s"%\
+            (engine, dt, peak/1.e6, tref/dt, same))
@@ -0,0 +1,63 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_meanFilter.py
+   scaling of the execution time of meanFilter() with the number
+   of samples and the width of the sliding window, compared to
+   the loop over samples used in previous versions; the results
+   are checked against the loop for small arrays
+
+   uses PhyPraKit.meanFilter()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, time, numpy as np
+  import PhyPraKit as ppk
+
+  # check for / read command line arguments
+  nmax = int(float(sys.argv[1])) if len(sys.argv)==2 else 10**7
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  def loop(a, width):
+    # loop over samples, as in previous versions of meanFilter()
+    l = len(a)
+    av = np.zeros(l)
+    k = int(width/2)
+    for i in range(k, l-k+1):
+      av[i] = sum(a[i-k:i+k+1])/(2*k+1)
+    return av
+
+  def best(f, *args):
+    # execution time, best of three
+    dt = 1.e9
+    for i in range(3):
+      t0 = time.time()
+      f(*args)
+      dt = min(dt, time.time() - t0)
+    return dt
+
+  print("   samples  width   loop (s)   meanFilter (s)   agreement")
+  n = 1000
+  while n <= nmax:
+    a = np.random.normal(size=n) + 10.
+    for width in (11, 101, 1001):
+      if n <= 10**5: # loop too slow for large arrays
+        tl = best(loop, a, width)
+        same = np.allclose(ppk.meanFilter(a, width), loop(a, width),
+                           rtol=1.e-12, atol=0.)
+        sloop = '%8.3f'%tl
+      else:
+        sloop, same = '       -', '-'
+      print("  %8.0e  %5i   %s        %8.4f        %s"%(n, width, sloop,
+             best(ppk.meanFilter, a, width), same))
+    n *= 10
+
+  # 2d array (channels x samples) with different edge treatments
+  a = np.random.normal(size=(4, nmax//4))
+  print("\n     %i channels x %i samples, width 101"%a.shape)
+  for edge in ('zero', 'valid', 'shrink', 'reflect'):
+    print("  edge %-8s %8.4f s"%(edge,
+      best(ppk.meanFilter, a, 101, edge, 1)))
@@ -0,0 +1,53 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_readtxt.py
+   throughput (in MB/s) of readtxt() for a large text file, 
+   compared to line-by-line filtering and conversion with 
+   numpy.loadtxt(); the results are checked value by value
+
+   uses PhyPraKit.readtxt()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, time, tempfile, numpy as np
+  import PhyPraKit as ppk
+
+  # check for / read command line arguments
+  nrep = int(sys.argv[1]) if len(sys.argv)==2 else 50
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # create a large file by replicating the data lines of Temperaturen.txt
+  with open('Temperaturen.txt', 'r') as f:
+    lines = f.readlines()
+  hlines, dlines = lines[:2], lines[2:]
+  fname = os.path.join(tempfile.mkdtemp(), 'big_Temperaturen.txt')
+  with open(fname, 'w') as f:
+    f.writelines(hlines + dlines*nrep)
+  size = os.path.getsize(fname)/1.e6
+  print('     file with %i lines, %.1f MB' % (len(dlines)*nrep, size))
+
+  def reference(fname):
+    # line-by-line filtering, as in previous versions of readtxt()
+    with open(fname, 'r') as f:
+      for i in range(2): f.readline()
+      return np.loadtxt(ppk._specialCharFilter(f, '\t'), dtype=np.float32,
+                        delimiter='\t', unpack=True)
+  def bulk(fname):
+    return ppk.readtxt(fname, nlhead=2, delim='\t', cache=False)[1]
+
+  print("  method        time (s)    MB/s   identical")
+  for name, reader in (('line-by-line', reference), ('bulk', bulk)):
+    dt = 1.e9
+    for i in range(3):
+      t0 = time.time()
+      data = reader(fname)
+      dt = min(dt, time.time() - t0)
+    if reader is reference: ref = data
+    print("  %-12s  %8.3f  %6.1f   %s"%(name, dt, size/dt,
+                                          np.array_equal(data, ref)))
+  os.remove(fname)
+  os.rmdir(os.path.dirname(fname))
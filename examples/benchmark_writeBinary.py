@@ -0,0 +1,58 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''benchmark_writeBinary.py
+   compare the round trip write - read of data in .csv format 
+   (writeCSV, readCSV) with the binary format (writeBinary, readBinary)
+
+   uses PhyPraKit.writeCSV(), readCSV(), writeBinary(), readBinary()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, time, tempfile, numpy as np
+  from PhyPraKit import writeCSV, readCSV, writeBinary, readBinary
+
+  # check for / read command line arguments
+  nrows = int(sys.argv[1]) if len(sys.argv)==2 else 200000
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # simulated data: time and 7 channels
+  ncols = 8
+  t = np.linspace(0., 1., nrows)
+  ldata = [t] + [np.sin(2.*np.pi*(i+1)*10.*t) + 0.01*np.random.randn(nrows)
+                 for i in range(ncols-1)]
+  hlines = ['time,' + ','.join(['channel %i'%(i+1) for i in range(ncols-1)])]
+  print('     %i columns with %i values'%(ncols, nrows))
+
+  tmpdir = tempfile.mkdtemp()
+  fcsv = os.path.join(tmpdir, 'data.csv')
+  fbin = os.path.join(tmpdir, 'data.ppk')
+
+  print("  format   write (s)   read (s)   size (MB)   max. deviation")
+  for name in ('csv', 'binary'):
+    t0 = time.time()
+    if name == 'csv':
+      writeCSV(fcsv, ldata, hlines=hlines)
+    else:
+      writeBinary(fbin, ldata, hlines=hlines, 
+                  names=['t'] + ['U%i'%(i+1) for i in range(ncols-1)],
+                  units=['s'] + ['V']*(ncols-1))
+    t1 = time.time()
+    if name == 'csv':
+      hl, data = readCSV(fcsv, nlhead=1, cache=False)
+    else:
+      hl, data, meta = readBinary(fbin)
+    s = sum([np.sum(d) for d in data]) # touch all values
+    t2 = time.time()
+    dmax = max([np.max(np.abs(d - c)) for d, c in zip(data, ldata)])
+    size = os.path.getsize(fcsv if name=='csv' else fbin)/1.e6
+    print("  %-7s  %8.3f   %8.3f    %8.1f      %.2g"%(name, t1-t0, t2-t1, 
+                                                        size, dmax))
+    del data
+
+  os.remove(fcsv)
+  os.remove(fbin)
+  os.rmdir(tmpdir)
@@ -0,0 +1,76 @@
+from __future__ import print_function  # for python2.7 compatibility
+'''test_LombScargle.py
+   amplitude spectrum of a time series with missing samples:
+   data of a torsion pendulum recorded with CASSY,
+   a fraction of the samples is removed at random
+
+   FourierSpectrum() with method 'fast' requires equidistant sampling 
+   times and falls back to method 'exact', which is slow; 
+   LombScargle() is fast and uses the actual time values
+
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage of LombScargle ------
+if __name__ == "__main__":
+  import numpy as np, matplotlib.pyplot as plt, PhyPraKit as ppk
+  import sys, time
+
+  # check for / read command line arguments
+  fdrop = float(sys.argv[1]) if len(sys.argv)==2 else 0.3
+  fname = "Drehpendel.labx"
+  print('\n*==* script ' + sys.argv[0]+ ' executing \n',\
+      '     processing file ' + fname)
+
+  # read data from CASSY
+  names, values = ppk.labxParser(fname, prlevel=0)
+  for tag, v in zip(names, values):
+    if tag.split(':')[1] == 'Zeit': t = np.array(v)
+    if tag.split(':')[1] == 'Winkel': phi = ppk.offsetFilter(np.array(v))
+
+  # remove a fraction of the samples
+  np.random.seed(314159)
+  keep = np.sort(np.random.choice(len(t), int((1.-fdrop)*len(t)),
+                                  replace=False))
+  tr, phir = t[keep], phi[keep]
+  print("  %i of %i samples kept"%(len(tr), len(t)))
+
+  print("** Fourier Spectrum")
+  freq0, amp0 = ppk.FourierSpectrum(t, phi, fmax=1.)
+  results = {}
+  for name, spectrum in (
+   ('exact', lambda: ppk.FourierSpectrum(tr, phir, fmax=1.)),
+   ('LombScargle', lambda: ppk.LombScargle(tr, phir, fmax=1.)) ):
+    t0 = time.time()
+    f, a = spectrum()
+    results[name] = (f, a)
+    print(" --> %-12s %.3f s, Frequenz mit max. Amplitude: %.4f,"%\
+          (name, time.time()-t0, f[np.argmax(a)]), 
+          "Amplitude %.3f (alle Messpunkte: %.3f)"%(a.max(), amp0.max()))
+  freqF, ampF = results['exact']
+  freqL, ampL = results['LombScargle']
+
+# make  plots
+  fig=plt.figure(1, figsize=(7.5, 7.5))
+  fig.suptitle('Script: test_LombScargle.py', size='x-large', color='b')
+  fig.subplots_adjust(left=0.14, bottom=0.1, right=0.97, top=0.93,
+                    wspace=None, hspace=.25)#
+  ax1=fig.add_subplot(2, 1, 1)
+  ax1.plot(tr, phir, 'b.', markersize=1)
+  ax1.set_xlabel('$Zeit$ (s)', size='large')
+  ax1.set_ylabel('$Winkel$', size='large')
+  ax1.grid()
+
+  ax2=fig.add_subplot(2,1,2)
+  ax2.plot(freq0, amp0, 'k-', label='alle Messpunkte')
+  ax2.plot(freqF, ampF, 'r-', label='FourierSpectrum()')
+  ax2.plot(freqL, ampL, 'b--', label='LombScargle()')
+  ax2.set_xlabel('$Frequenz$ $f$ (Hz)', size='large')
+  ax2.set_ylabel('$Amplitude$', size='large')
+  ax2.set_yscale('log')
+  ax2.legend(loc='best')
+  ax2.grid()
+
+  plt.show()
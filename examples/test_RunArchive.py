@@ -0,0 +1,41 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_RunArchive.py 
+   store the example files in an archive of measurements (runs) 
+   and query the archive for runs with a given quantity
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, shutil, tempfile
+  from PhyPraKit import RunArchive
+
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+  files = ["CassyExample.labx", "Drehpendel.labx", "GammaSpektra.labx",
+           "Cassy.txt", "PicoScopeData.txt", "Wellenform.csv", 
+           "Temperaturen.txt", "AudioData.csv", "xyData.dat"]
+
+  # archive in temporary directory; files are read only once
+  adir = tempfile.mkdtemp()
+  with RunArchive(adir) as ar:
+    for f in files:
+      ar.add(f, prlevel=0)
+
+    print('     %i runs in archive'%len(ar))
+    for run, fname, fmt, nch, nsamples, tmin, tmax in ar.runs():
+      print('     %2i  %-10s %2i channels, %5i values  %s'%(run, fmt, nch, 
+                                                            nsamples, fname))
+
+    # all runs with channel "Winkel" with more than 10^4 values
+    print('\n     query: quantity Winkel, more than 10000 values')
+    for run, tag, values in ar.select(quantity='Winkel', minsamples=1e4):
+      print('     run %i, channel %s: %i values, first: %s'%(run, tag, 
+                                                     len(values), values[:3]))
+    # runs with voltage measurements
+    print('     runs with channels in V:', ar.find(unit='V'))
+
+  del values # memory-mapped array
+  shutil.rmtree(adir)
@@ -0,0 +1,44 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_followtxt.py 
+   follow a file which is still being written during data taking; 
+   the growing file is simulated by appending pieces of the file 
+   Temperaturen.txt to a temporary file
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, time, tempfile, numpy as np
+  from PhyPraKit import followtxt
+
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    fname = sys.argv[1]
+  else:
+    fname = "Temperaturen.txt"
+  print(('\n*==* script ' + sys.argv[0]+ ' executing \n',\
+      '     processing file ' + fname)) 
+
+  with open(fname, 'rb') as f: 
+    raw = f.read()
+  tmpname = os.path.join(tempfile.mkdtemp(), 'growing.txt')
+  open(tmpname, 'wb').close()
+
+  poll = followtxt(tmpname, nlhead=2)
+  nread = 0
+  for i in range(0, len(raw), 5000):
+    # "data taking": append 5000 bytes, last line may be incomplete
+    with open(tmpname, 'ab') as f:
+      f.write(raw[i:i+5000])
+    # read new lines
+    hlines, data = next(poll)
+    nread += data.shape[1]
+    print('   poll %i: %i new lines, %i in total'%(i/5000, data.shape[1], nread))
+    time.sleep(0.1)
+
+  print('     header:', hlines)
+  os.remove(tmpname)
+  os.rmdir(os.path.dirname(tmpname))
@@ -0,0 +1,50 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_parseCache.py 
+   read a CASSY file twice with the persistent parse cache enabled:
+   the first call parses the file and stores the result, the second 
+   call loads it from the cache; the results are compared, and the
+   arrays from the cache are modified (copy-on-write, the cache 
+   itself remains unchanged)
+
+   uses PhyPraKit.setParseCache(), PhyPraKit.labxParser()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, time, tempfile, shutil, numpy as np
+  import PhyPraKit as ppk
+
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    fname = sys.argv[1]
+  else:
+    fname = "Drehpendel.labx"
+  print('\n*==* script ' + sys.argv[0]+ ' executing \n',\
+      '     processing file ' + fname) 
+
+  cdir = tempfile.mkdtemp()
+  ppk.setParseCache(cdir)
+
+  results = []
+  for i in range(3):
+    t0 = time.time()
+    tags, data = ppk.labxParser(fname, prlevel=0) # silent, also if cached
+    print("  call %i: %.3f s"%(i+1, time.time() - t0))
+    # subtract offset in place, also works for arrays from cache
+    data[1] -= data[1][0]
+    results.append((tags, [np.array(d) for d in data]))
+
+  same = all([r[0] == results[0][0] and 
+              all([np.array_equal(a, b, equal_nan=True) 
+                   for a, b in zip(r[1], results[0][1])]) 
+              for r in results])
+  print("  identical results (cache not modified by changes of arrays):",
+        same)
+  ppk.parseCacheInfo()
+
+  ppk.setParseCache(None)
+  shutil.rmtree(cdir)
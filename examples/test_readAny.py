@@ -0,0 +1,40 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_readAny.py
+   read the example files with the input function appropriate for
+   their format; a file with columns aligned by a varying number of
+   blanks and tabs and with text header lines is written to a
+   temporary directory and read as well
+
+   uses PhyPraKit.readAny()
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, tempfile, shutil, numpy as np
+  import PhyPraKit as ppk
+
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # example files
+  files = sys.argv[1:] if len(sys.argv) > 1 else \
+    ['CassyExample.labx', 'Cassy.txt', 'PicoScopeData.txt', 'Wellenform.csv',
+     'Hysterese.csv', 'Temperaturen.txt', 'xyData.dat']
+  for fname in files:
+    fmt, hinfo, data = ppk.readAny(fname)
+    print("  %-20s format %-10s %i columns"%(fname, fmt, len(data)))
+
+  # columns separated by white space of varying width
+  tdir = tempfile.mkdtemp()
+  fname = os.path.join(tdir, 'aligned.txt')
+  with open(fname, 'w') as f:
+    f.write('Zeit   Spannung\ns      V\n\n')
+    f.write('0.0    1.25\n0.5\t  -2.5\n10.0   3,75\n')
+  fmt, hinfo, data = ppk.readAny(fname, prlevel=1)
+  print("  header:", hinfo)
+  print("  data as expected:", np.allclose(data, [[0., 0.5, 10.],
+                                                  [1.25, -2.5, 3.75]]))
+  shutil.rmtree(tdir)
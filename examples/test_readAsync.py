@@ -0,0 +1,44 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_readAsync.py 
+   read files in an application based on asyncio: the event loop 
+   stays responsive (a "heartbeat" is printed every 0.2 s) while 
+   files are read and parsed in the background
+
+   (requires python 3)
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, time, asyncio
+  from PhyPraKit import readManyAsync, readAsync, labxParser, readPicoScope
+
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    files = sys.argv[1]  # file name(s), wildcards possible
+  else:
+    files = ["CassyExample.labx", "Drehpendel.labx", "GammaSpektra.labx"]*4
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  loop = asyncio.new_event_loop()
+  asyncio.set_event_loop(loop)
+  t0 = time.time()
+
+  def heartbeat():
+    print('   event loop alive at %.2f s'%(time.time()-t0))
+    loop.call_later(0.2, heartbeat)
+
+  def start():
+    # start reading files, at most 2 at a time, while the loop is running
+    single = readAsync('Wellenform.csv', readPicoScope)
+    many = readManyAsync(files, labxParser, nproc=2, prlevel=0, engine='fast')
+    return asyncio.gather(single, many)
+
+  loop.call_soon(heartbeat)
+  (units, data), (results, errors) = loop.run_until_complete(start())
+  print('     %i files read in %.2f s, %i failed'%(len(results)+1, 
+                                                 time.time()-t0, len(errors)))
+  loop.close()
@@ -0,0 +1,51 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_readBlocks.py 
+   read data exported by PicoScope usb-oscilloscope in blocks 
+   of lines and fill a histogram block by block; memory usage 
+   is independent of the size of the input file
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import numpy as np, matplotlib.pyplot as plt
+  from PhyPraKit import readPicoScope
+  import sys
+  
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    fname = sys.argv[1]
+  else:
+    fname = "PicoScopeData.txt"
+  print(('\n*==* script ' + sys.argv[0]+ ' executing \n',\
+      '     processing file ' + fname)) 
+
+  # read data from PicoScope, blocks of 10 lines
+  units, blocks = readPicoScope(fname, prlevel=1, blocksize=10)
+  ic = len(units)
+
+  # fill histograms of channel data block by block
+  bedges = np.linspace(-3.5, 3.5, 36)
+  hists = np.zeros((ic-1, len(bedges)-1))
+  nblocks, nvalues = 0, 0
+  for data in blocks:
+    nblocks += 1
+    nvalues += data.shape[1] 
+    for i in range(1, ic):
+      hists[i-1] += np.histogram(data[i], bins=bedges)[0]
+  print("     %i values read in %i blocks"%(nvalues, nblocks))
+
+# make a plot
+  fig=plt.figure(1, figsize=(5.,5.))
+  ax1=fig.add_subplot(1, 1, 1)
+  bcent = (bedges[1:] + bedges[:-1])/2.
+  for i in range(1, ic):
+    ax1.step(bcent, hists[i-1], where='mid', label='channel %i'%i)
+  ax1.set_xlabel('voltage (' + units[1] + ')')
+  ax1.set_ylabel('frequency')
+  ax1.legend()
+
+  plt.show()
@@ -0,0 +1,37 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_readMany.py 
+   read a number of files in parallel processes with readMany(),
+   compared to reading them one after the other
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, time
+  from PhyPraKit import readMany, labxParser
+  
+  # check for / read command line arguments
+  if len(sys.argv)==2:
+    files = sys.argv[1]  # file name(s), wildcards possible
+  else:
+    files = ["CassyExample.labx", "Drehpendel.labx", "GammaSpektra.labx"]*4
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # read files one after the other ...
+  t0 = time.time()
+  results, errors = readMany(files, labxParser, nproc=1, prlevel=0,
+                             engine='fast')
+  t1 = time.time()
+  # ... and in parallel processes
+  results, errors = readMany(files, labxParser, prlevel=0, engine='fast')
+  t2 = time.time()
+
+  print('     %i files read, %i failed'%(len(results), len(errors)))
+  for r in results:
+    if r is not None: 
+      tags, values = r
+      print('      ', len(tags), 'channels:', tags)
+  print('     time sequential: %.2f s, parallel: %.2f s'%(t1-t0, t2-t1))
@@ -0,0 +1,48 @@
+from __future__ import print_function  # for python2.7 compatibility
+
+'''test_readPicoScopeSegments.py 
+   read a series of waveforms in PicoScope format (one file per 
+   segment, as exported in rapid-block mode) into one 3d array 
+   and average over segments; the waveforms are simulated 
+   (noisy pulses) and stored in a temporary directory
+
+.. moduleauthor:: Guenter Quast <g.quast@kit.edu>
+
+'''
+
+# -----example Code illustrating usage --------------------
+if __name__ == "__main__":
+  import sys, os, shutil, tempfile, numpy as np, matplotlib.pyplot as plt
+  from PhyPraKit import readPicoScopeSegments
+
+  # check for / read command line arguments
+  nseg = int(sys.argv[1]) if len(sys.argv)==2 else 100
+  print('\n*==* script ' + sys.argv[0]+ ' executing')
+
+  # simulate waveforms: noisy pulses on channel A, trigger on channel B
+  tmpdir = tempfile.mkdtemp()
+  t = np.linspace(0., 10., 1000)
+  for i in range(nseg):
+    pulse = np.exp(-(t-4.)**2/0.5) + 0.3*np.random.randn(len(t))
+    trigger = np.where(t>3., 1., 0.)
+    with open(os.path.join(tmpdir, 'wave_%i.txt'%(i+1)), 'w') as f:
+      f.write('Zeit\tKanal A\tKanal B\n(ms)\t(V)\t(V)\n\n')
+      np.savetxt(f, np.array([t, pulse, trigger]).T, fmt='%.5g', delimiter='\t')
+
+  # read all segments, and average over segments
+  units, data = readPicoScopeSegments(os.path.join(tmpdir, 'wave_*.txt'), 
+                                      prlevel=1)
+  shutil.rmtree(tmpdir)
+  average = data[:, 1, :].mean(axis=0)
+
+# make a plot
+  fig=plt.figure(1, figsize=(7.5, 5.))
+  ax1=fig.add_subplot(1, 1, 1)
+  ax1.plot(data[0, 0], data[0, 1], 'b-', alpha=0.3, label='single segment')
+  ax1.plot(data[0, 0], average, 'r-', 
+           label='average of %i segments'%data.shape[0])
+  ax1.set_xlabel('time ' + units[0])
+  ax1.set_ylabel('voltage ' + units[1])
+  ax1.legend()
+
+  plt.show()
@@ -38,7 +38,7 @@ setup(
     #long_description='todo: add long description',  # open('README.txt').read()
     long_description=open('README.rst').read(),
     setup_requires=[\
-        "NumPy >= 1.7.1",
+        "NumPy >= 1.15.0",
         "SciPy >= 0.12.0",
         "matplotlib >= 1.5.0",]
 )